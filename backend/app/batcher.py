@@ -0,0 +1,151 @@
+"""Request coalescing for batched POS analysis."""
+import asyncio
+import logging
+from concurrent.futures import Executor
+from typing import List, Optional, Set
+
+from .models import TokenData
+from .pos_analyzer import POSAnalyzer
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisBatcher:
+    """Coalesces concurrent analysis requests into a single batched spaCy call."""
+
+    def __init__(
+        self,
+        analyzer: POSAnalyzer,
+        executor: Optional[Executor] = None,
+        window: float = 0.01,
+        max_batch_size: int = 32
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            analyzer: The analyzer used to process batches
+            executor: Executor that runs the CPU-bound spaCy work off the event loop
+                      (default: the event loop's default executor)
+            window: Seconds to wait for more requests after the first one arrives
+            max_batch_size: Maximum number of texts processed per batch
+        """
+        self.analyzer = analyzer
+        self.executor = executor
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._batches: Set[asyncio.Task] = set()
+
+    def start(self) -> None:
+        """Start the background task that drains the request queue."""
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background task and fail any requests still waiting."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        # Let batches already handed to the executor finish
+        if self._batches:
+            await asyncio.gather(*self._batches, return_exceptions=True)
+
+        while self._queue and not self._queue.empty():
+            self._fail_pending([self._queue.get_nowait()])
+
+    @staticmethod
+    def _fail_pending(batch: list) -> None:
+        """Fail the futures of requests that will never be processed."""
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(RuntimeError("Analysis batcher stopped"))
+
+    async def analyze(self, text: str) -> List[TokenData]:
+        """
+        Queue a text for analysis and wait for its result.
+
+        Args:
+            text: The German text to analyze
+
+        Returns:
+            List of TokenData objects with POS information
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def _run(self) -> None:
+        """Collect queued requests into batches and process them."""
+        loop = asyncio.get_running_loop()
+        batch = []
+        try:
+            while True:
+                batch = [await self._queue.get()]
+
+                # Keep collecting until the window closes or the batch is full
+                deadline = loop.time() + self.window
+                while len(batch) < self.max_batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+
+                # Process in the background so the next batch can start collecting
+                task = asyncio.create_task(self._process(batch))
+                self._batches.add(task)
+                task.add_done_callback(self._batches.discard)
+                batch = []
+        except asyncio.CancelledError:
+            # Requests already taken off the queue for a batch that was never started
+            self._fail_pending(batch)
+            raise
+
+    async def _process(self, batch: list) -> None:
+        """Analyze a batch of texts in the executor and resolve their futures."""
+        texts = [text for text, _ in batch]
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(self.executor, self._analyze_batch, texts)
+        except Exception as e:
+            results = [e] * len(batch)
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def _analyze_batch(self, texts: List[str]) -> list:
+        """
+        Analyze a batch of texts (runs in the executor).
+
+        Falls back to per-text analysis if the batched call fails, so a
+        single bad text doesn't fail every request in the batch.
+
+        Returns:
+            One entry per text: its TokenData list, or the exception it raised
+        """
+        try:
+            return self.analyzer.analyze_texts(texts, batch_size=self.max_batch_size)
+        except Exception as e:
+            logger.warning("Batched analysis failed, retrying individually: %s", e)
+
+        results = []
+        for text in texts:
+            try:
+                results.append(self.analyzer.analyze_text(text))
+            except Exception as item_error:
+                results.append(item_error)
+        return results
@@ -1,30 +1,117 @@
 """Caching layer for POS analysis results."""
+from array import array
+from bisect import bisect_left, bisect_right
 from cachetools import TTLCache
 import hashlib
-import json
-from typing import Optional, List
-from .models import Token
+from typing import NamedTuple, Optional, List, Tuple, Union
+from .models import TokenData
+
+# Texts shorter than this are used directly as their own cache key
+SHORT_TEXT_KEY_LIMIT = 512
+
+
+# Default memory budget for cached entries (approximate bytes)
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Rough per-token overhead of the packed arrays and list slots
+_TOKEN_OVERHEAD_BYTES = 32
+
+
+class PackedTokens:
+    """
+    Struct-of-arrays storage of the token offsets and pairings.
+
+    Responses are served from the cached JSON, so only the columns needed
+    to resolve a target position (find_target) are kept: one array per
+    field instead of one object per token.
+    """
+
+    __slots__ = ('starts', 'ends', 'paired_with')
+
+    def __init__(self, tokens: List[TokenData]):
+        """Pack the offsets and pairings of a list of TokenData objects."""
+        self.starts = array('i', (t.start for t in tokens))
+        self.ends = array('i', (t.end for t in tokens))
+        self.paired_with = [t.paired_with for t in tokens]
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def find_target(self, position: int) -> Optional[Tuple[int, List[int]]]:
+        """
+        Locate the token covering a character position and its paired tokens.
+
+        Args:
+            position: Character position in the analyzed text
+
+        Returns:
+            (token index, indices of its paired tokens), or None if no token covers the position
+        """
+        starts = self.starts
+        # Tokens are in text order, so starts is sorted
+        i = bisect_right(starts, position) - 1
+        if i < 0 or position >= self.ends[i]:
+            return None
+
+        paired_indices = []
+        for paired_start in self.paired_with[i] or ():
+            j = bisect_left(starts, paired_start)
+            if j < len(starts) and starts[j] == paired_start:
+                paired_indices.append(j)
+        return i, paired_indices
+
+
+class CachedAnalysis(NamedTuple):
+    """A cached analysis: the packed token offsets and its serialized JSON response."""
+    packed: PackedTokens
+    json: bytes
+
+
+def _entry_size(entry: CachedAnalysis) -> int:
+    """Approximate the memory footprint of a cache entry in bytes."""
+    return len(entry.json) + _TOKEN_OVERHEAD_BYTES * len(entry.packed)
 
 
 class AnalysisCache:
     """Cache for storing POS analysis results."""
 
-    def __init__(self, maxsize: int = 1000, ttl: int = 300):
+    def __init__(self, maxsize: int = DEFAULT_MAX_BYTES, ttl: int = 300):
         """
         Initialize the cache.
 
+        Entries are bounded by approximate size rather than count, so a few
+        long documents and many one-word lookups share the same budget.
+        Least recently used entries are evicted first once it is exceeded.
+
         Args:
-            maxsize: Maximum number of cached items
+            maxsize: Maximum total size of cached items in bytes (default: 64 MB)
             ttl: Time to live in seconds (default: 5 minutes)
         """
-        self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl, getsizeof=_entry_size)
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """
+        Canonicalize text so near-duplicate requests share a cache entry.
 
-    def _generate_key(self, text: str) -> str:
+        Only trailing whitespace is removed: token offsets are character
+        positions into the caller's text, so anything that shifts them
+        (whitespace collapsing, leading strip, NFC composition) would make
+        a cached result point at the wrong characters.
+        """
+        return text.rstrip()
+
+    def _generate_key(self, text: str) -> Union[str, bytes]:
         """Generate a cache key from text."""
-        # Use hash of the text as the key
-        return hashlib.md5(text.encode('utf-8')).hexdigest()
+        text = self.normalize(text)
+        # Short texts (single words, phrases) are cheaper to key on directly;
+        # str and bytes keys never compare equal, so they can't collide with digests
+        if len(text) < SHORT_TEXT_KEY_LIMIT:
+            return text
+        # 8-byte BLAKE2b digest: faster than MD5 and far from colliding at cache scale
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest()
 
-    def get(self, text: str) -> Optional[List[Token]]:
+    def get(self, text: str) -> Optional[CachedAnalysis]:
         """
         Retrieve cached analysis result.
 
@@ -32,21 +119,31 @@ class AnalysisCache:
             text: The text that was analyzed
 
         Returns:
-            List of Token objects if cached, None otherwise
+            CachedAnalysis with packed offsets and response JSON if cached, None otherwise
         """
         key = self._generate_key(text)
         return self.cache.get(key)
 
-    def set(self, text: str, tokens: List[Token]) -> None:
+    def set(self, text: str, tokens: List[TokenData], json_bytes: bytes) -> CachedAnalysis:
         """
         Store analysis result in cache.
 
         Args:
             text: The text that was analyzed
             tokens: The analysis result
+            json_bytes: The serialized AnalyzeResponse for the result
+
+        Returns:
+            The entry that was built (returned even if it was too large to cache)
         """
         key = self._generate_key(text)
-        self.cache[key] = tokens
+        entry = CachedAnalysis(PackedTokens(tokens), json_bytes)
+        try:
+            self.cache[key] = entry
+        except ValueError:
+            # Entry alone exceeds the cache budget; skip caching it
+            pass
+        return entry
 
     def clear(self) -> None:
         """Clear all cached items."""
@@ -56,6 +153,7 @@ class AnalysisCache:
         """Get cache statistics."""
         return {
             'size': len(self.cache),
+            'bytes': self.cache.currsize,
             'maxsize': self.cache.maxsize,
             'ttl': self.cache.ttl
         }
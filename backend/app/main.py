@@ -1,10 +1,20 @@
 """FastAPI application for German POS analysis."""
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+import asyncio
 import logging
+import orjson
+import os
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
+from typing import List, Optional, Tuple
 
 from .models import (
+    AnalyzeBatchRequest,
+    AnalyzeBatchResponse,
     AnalyzeRequest,
     AnalyzeResponse,
     POSCategory,
@@ -12,7 +22,8 @@ from .models import (
     HealthResponse
 )
 from .pos_analyzer import POSAnalyzer
-from .cache import analysis_cache
+from .batcher import AnalysisBatcher
+from .cache import CachedAnalysis, analysis_cache
 
 # Configure logging
 logging.basicConfig(
@@ -24,6 +35,9 @@ logger = logging.getLogger(__name__)
 # Global analyzer instance (loaded once at startup)
 analyzer: POSAnalyzer = None
 
+# Global batcher that coalesces concurrent analysis requests
+batcher: AnalysisBatcher = None
+
 
 # POS color mappings (same as extension)
 POS_COLORS = {
@@ -68,20 +82,47 @@ POS_LABELS = {
     'X': 'Other'
 }
 
+# POS categories are static, so build the response once at import time
+POS_CATEGORIES_RESPONSE = POSCategoriesResponse(
+    categories=[
+        POSCategory(pos=pos, color=color, label=POS_LABELS.get(pos, pos))
+        for pos, color in POS_COLORS.items()
+    ]
+)
+
+# AnalyzeResponse fields computed per request, left out of the cached body
+TARGET_FIELDS = {"target_index", "paired_indices"}
+
+# Upper bound on texts per /analyze_batch request
+MAX_BATCH_TEXTS = 64
+
+# Limit on the decompressed size of a gzip-encoded request body
+MAX_DECOMPRESSED_BODY_BYTES = 8 * 1024 * 1024
+
+# Health responses only depend on whether the model is loaded, so build both once
+HEALTH_READY = HealthResponse(status="ready", model_loaded=True)
+HEALTH_LOADING = HealthResponse(status="loading", model_loaded=False)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager - loads model at startup."""
-    global analyzer
+    global analyzer, batcher
     logger.info("Starting up - loading spaCy model...")
+    # spaCy is CPU-bound, so analysis runs in a bounded pool instead of on the event loop
+    thread_pool = ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1))
     try:
         analyzer = POSAnalyzer()
+        batcher = AnalysisBatcher(analyzer, executor=thread_pool)
+        batcher.start()
         logger.info("Application startup complete")
     except Exception as e:
         logger.error(f"Failed to load spaCy model: {e}")
         raise
     yield
     logger.info("Shutting down")
+    await batcher.stop()
+    thread_pool.shutdown()
 
 
 # Initialize FastAPI app
@@ -89,7 +130,8 @@ app = FastAPI(
     title="German POS Highlighter API",
     description="API for analyzing German text and identifying parts of speech",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS to allow Chrome extension requests
@@ -101,6 +143,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger responses (e.g. /analyze_batch) for clients that accept gzip
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 
 @app.get("/", tags=["root"])
 async def root():
@@ -115,72 +160,311 @@ async def root():
 @app.get("/api/v1/health", response_model=HealthResponse, tags=["health"])
 async def health_check():
     """Health check endpoint - returns 200 OK even while model is loading."""
-    model_loaded = analyzer is not None
     # Always return 200 OK so Railway doesn't fail the health check during model loading
-    return HealthResponse(
-        status="ready" if model_loaded else "loading",
-        model_loaded=model_loaded
-    )
+    return HEALTH_READY if analyzer is not None else HEALTH_LOADING
 
 
 @app.get("/api/v1/pos-categories", response_model=POSCategoriesResponse, tags=["metadata"])
 async def get_pos_categories():
     """Get all available POS categories with their colors and labels."""
-    categories = [
-        POSCategory(pos=pos, color=color, label=POS_LABELS.get(pos, pos))
-        for pos, color in POS_COLORS.items()
-    ]
-    return POSCategoriesResponse(categories=categories)
+    return POS_CATEGORIES_RESPONSE
+
+
+def parse_analyze_request(body: bytes) -> Tuple[str, Optional[int]]:
+    """
+    Extract the text and target position from a raw /analyze request body.
+
+    The request schema is a single string plus optional target hints,
+    so it is checked directly instead of building an AnalyzeRequest
+    model per request. target_word is not needed: the position alone
+    identifies the target token.
+
+    Args:
+        body: Raw JSON request body
+
+    Returns:
+        (text to analyze, target character position or None)
+    """
+    try:
+        payload = orjson.loads(body)
+    except orjson.JSONDecodeError:
+        raise HTTPException(
+            status_code=400,
+            detail="Request body must be valid JSON"
+        )
+
+    text = payload.get("text") if isinstance(payload, dict) else None
+    if not isinstance(text, str):
+        raise HTTPException(
+            status_code=422,
+            detail="Field 'text' is required and must be a string"
+        )
+
+    target_position = payload.get("target_position")
+    if target_position is not None and (
+        not isinstance(target_position, int) or isinstance(target_position, bool)
+    ):
+        raise HTTPException(
+            status_code=422,
+            detail="Field 'target_position' must be an integer"
+        )
+
+    return text, target_position
+
+
+async def read_body(request: Request) -> bytes:
+    """
+    Read a request body, decoding it if it was sent gzip-compressed.
+
+    Args:
+        request: The incoming request
+
+    Returns:
+        The raw (uncompressed) body bytes
+    """
+    body = await request.body()
+    encoding = request.headers.get("content-encoding", "identity").strip().lower()
+    if encoding == "identity":
+        return body
+    if encoding != "gzip":
+        raise HTTPException(
+            status_code=415,
+            detail=f"Unsupported Content-Encoding: {encoding}"
+        )
+
+    # wbits=31 expects a gzip header; max_length stops decompression bombs early
+    decompressor = zlib.decompressobj(wbits=31)
+    try:
+        data = decompressor.decompress(body, MAX_DECOMPRESSED_BODY_BYTES)
+    except zlib.error:
+        raise HTTPException(
+            status_code=400,
+            detail="Request body is not valid gzip data"
+        )
+    if decompressor.unconsumed_tail:
+        raise HTTPException(
+            status_code=413,
+            detail="Decompressed request body is too large"
+        )
+    if not decompressor.eof:
+        raise HTTPException(
+            status_code=400,
+            detail="Request body is truncated gzip data"
+        )
+    return data
+
+
+def parse_analyze_batch_request(body: bytes) -> Tuple[List[str], List[Optional[int]]]:
+    """
+    Extract the texts and target positions from a raw /analyze_batch request body.
+
+    Args:
+        body: Raw JSON request body
+
+    Returns:
+        (texts to analyze, target character position or None per text), in request order
+    """
+    try:
+        payload = orjson.loads(body)
+    except orjson.JSONDecodeError:
+        raise HTTPException(
+            status_code=400,
+            detail="Request body must be valid JSON"
+        )
+
+    texts = payload.get("texts") if isinstance(payload, dict) else None
+    if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+        raise HTTPException(
+            status_code=422,
+            detail="Field 'texts' is required and must be a list of strings"
+        )
+
+    target_positions = payload.get("target_positions")
+    if target_positions is None:
+        return texts, [None] * len(texts)
+
+    if (
+        not isinstance(target_positions, list)
+        or len(target_positions) != len(texts)
+        or not all(
+            position is None or (isinstance(position, int) and not isinstance(position, bool))
+            for position in target_positions
+        )
+    ):
+        raise HTTPException(
+            status_code=422,
+            detail="Field 'target_positions' must be a list of integers or nulls, one per text"
+        )
+
+    return texts, target_positions
 
 
-@app.post("/api/v1/analyze", response_model=AnalyzeResponse, tags=["analysis"])
-async def analyze_text(request: AnalyzeRequest):
+async def analyze_cached(text: str) -> CachedAnalysis:
+    """
+    Return the analysis of a text, using the cache when possible.
+
+    Args:
+        text: Non-empty text to analyze
+
+    Returns:
+        CachedAnalysis with the packed tokens and serialized AnalyzeResponse
+    """
+    # Check cache first (hits return the already-serialized response)
+    cached_result = analysis_cache.get(text)
+    if cached_result:
+        logger.debug("Cache hit for text: %.50s...", text)
+        return cached_result
+
+    # Analyze the normalized text so the result is valid for every variant sharing its key
+    logger.debug("Analyzing text: %.50s...", text)
+    tokens = await batcher.analyze(analysis_cache.normalize(text))
+
+    # Serialize once and cache both the tokens and the response body
+    # (model_construct skips validation; the analyzer already produced valid fields)
+    response = AnalyzeResponse.model_construct(tokens=[token.to_model() for token in tokens])
+    # (target fields depend on the request, so they're added per response, not cached)
+    json_bytes = response.model_dump_json(exclude=TARGET_FIELDS).encode('utf-8')
+    return analysis_cache.set(text, tokens, json_bytes)
+
+
+def with_target(result: CachedAnalysis, target_position: Optional[int]) -> bytes:
+    """
+    Add the target token fields to a cached AnalyzeResponse body.
+
+    Args:
+        result: The cached analysis
+        target_position: Character position of the target word, if the request gave one
+
+    Returns:
+        JSON bytes of the AnalyzeResponse, with target_index/paired_indices
+        when a token covers target_position
+    """
+    target = result.packed.find_target(target_position) if target_position is not None else None
+    if target is None:
+        return result.json
+
+    target_index, paired_indices = target
+    # The cached body is a JSON object, so splice the fields in before its closing brace
+    return b"".join((
+        result.json[:-1],
+        b',"target_index":', orjson.dumps(target_index),
+        b',"paired_indices":', orjson.dumps(paired_indices),
+        b"}",
+    ))
+
+
+@app.post(
+    "/api/v1/analyze",
+    response_model=AnalyzeResponse,
+    tags=["analysis"],
+    # The body is parsed by hand, so document the schema explicitly
+    openapi_extra={
+        "requestBody": {
+            "content": {"application/json": {"schema": AnalyzeRequest.model_json_schema()}},
+            "required": True
+        }
+    }
+)
+async def analyze_text(request: Request):
     """
     Analyze German text and return POS tags for all tokens.
 
     This endpoint:
     1. Checks the cache for previous analysis of the same text
-    2. If not cached, analyzes the text using spaCy
+    2. If not cached, analyzes the text using spaCy (batched with concurrent requests)
     3. Detects separable verbs and links their parts
-    4. Returns structured token data with POS tags, lemmas, and positions
+    4. Returns structured token data with POS tags, lemmas, and positions,
+       plus the index of the token at target_position and its paired tokens
     """
+    text, target_position = parse_analyze_request(await request.body())
+
     if not analyzer:
         raise HTTPException(
             status_code=503,
             detail="Analyzer not initialized. Model loading may have failed."
         )
 
-    if not request.text or not request.text.strip():
+    if not text or not text.strip():
         raise HTTPException(
             status_code=400,
             detail="Text cannot be empty"
         )
 
     try:
-        # Check cache first
-        cached_result = analysis_cache.get(request.text)
-        if cached_result:
-            logger.info(f"Cache hit for text: {request.text[:50]}...")
-            return AnalyzeResponse(tokens=cached_result)
+        result = await analyze_cached(text)
+        json_bytes = with_target(result, target_position)
+        return Response(content=json_bytes, media_type="application/json")
 
-        # Analyze text
-        logger.info(f"Analyzing text: {request.text[:50]}...")
-        tokens = analyzer.analyze_text(
-            text=request.text,
-            target_word=request.target_word,
-            target_position=request.target_position
+    except Exception as e:
+        logger.error("Error analyzing text: %s", e, exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error analyzing text: {str(e)}"
         )
 
-        # Cache the result
-        analysis_cache.set(request.text, tokens)
 
-        return AnalyzeResponse(tokens=tokens)
+@app.post(
+    "/api/v1/analyze_batch",
+    response_model=AnalyzeBatchResponse,
+    tags=["analysis"],
+    # The body is parsed by hand, so document the schema explicitly
+    openapi_extra={
+        "requestBody": {
+            "content": {"application/json": {"schema": AnalyzeBatchRequest.model_json_schema()}},
+            "required": True
+        }
+    }
+)
+async def analyze_batch(request: Request):
+    """
+    Analyze several German texts in one request.
+
+    Each text is handled like a single /analyze call (cache lookup, then
+    analysis, then target_index/paired_indices for its target position).
+    Uncached texts are submitted concurrently, so the batcher coalesces
+    them into as few nlp.pipe calls as its batch size and window allow.
+    Results are returned in request order.
+
+    The request body may be sent gzip-compressed (Content-Encoding: gzip).
+    """
+    texts, target_positions = parse_analyze_batch_request(await read_body(request))
+
+    if not analyzer:
+        raise HTTPException(
+            status_code=503,
+            detail="Analyzer not initialized. Model loading may have failed."
+        )
+
+    if len(texts) > MAX_BATCH_TEXTS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {MAX_BATCH_TEXTS} texts can be analyzed per request"
+        )
+
+    if not all(text and text.strip() for text in texts):
+        raise HTTPException(
+            status_code=400,
+            detail="Texts cannot be empty"
+        )
+
+    try:
+        # Analyze each distinct text once, even if it repeats within the request
+        unique_texts = list(dict.fromkeys(texts))
+        unique_results = await asyncio.gather(*(analyze_cached(text) for text in unique_texts))
+        results_by_text = dict(zip(unique_texts, unique_results))
+
+        # Each result is already a serialized AnalyzeResponse, so splice them together
+        json_bytes = b'{"results":[' + b','.join(
+            with_target(results_by_text[text], position)
+            for text, position in zip(texts, target_positions)
+        ) + b']}'
+        return Response(content=json_bytes, media_type="application/json")
 
     except Exception as e:
-        logger.error(f"Error analyzing text: {e}", exc_info=True)
+        logger.error("Error analyzing batch: %s", e, exc_info=True)
         raise HTTPException(
             status_code=500,
-            detail=f"Error analyzing text: {str(e)}"
+            detail=f"Error analyzing texts: {str(e)}"
         )
 
 
@@ -199,4 +483,5 @@ async def clear_cache():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # uvloop/httptools ship with uvicorn[standard] and are faster than the asyncio defaults
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="uvloop", http="httptools")
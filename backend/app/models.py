@@ -1,14 +1,27 @@
-from pydantic import BaseModel, Field
-from typing import List, Optional
+from dataclasses import dataclass
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Optional, Tuple
 
 
 class AnalyzeRequest(BaseModel):
     """Request model for text analysis endpoint."""
+    model_config = ConfigDict(extra='ignore', validate_assignment=False)
+
     text: str = Field(..., description="German text to analyze")
     target_word: Optional[str] = Field(None, description="Specific word that was hovered")
     target_position: Optional[int] = Field(None, description="Character position of target word in text")
 
 
+class AnalyzeBatchRequest(BaseModel):
+    """Request model for batch text analysis endpoint."""
+    model_config = ConfigDict(extra='ignore', validate_assignment=False)
+
+    texts: List[str] = Field(..., description="German texts to analyze")
+    target_positions: Optional[List[Optional[int]]] = Field(
+        None, description="Character position of the target word per text (same length as texts)"
+    )
+
+
 class VerbPreposition(BaseModel):
     """Represents a preposition associated with a verb."""
     text: str
@@ -32,9 +45,60 @@ class Token(BaseModel):
     governs_case: Optional[str] = None  # For prepositions: the case they govern
 
 
+@dataclass(slots=True)
+class TokenData:
+    """
+    Internal token record produced by the analyzer (mirrors Token).
+
+    Building these skips Pydantic validation per token; they are converted
+    to Token models only at the response boundary.
+    """
+    text: str
+    pos: str
+    lemma: str
+    start: int
+    end: int
+    is_separable: bool = False
+    separable_parts: Optional[List[str]] = None
+    paired_with: Optional[List[int]] = None
+    is_reflexive: bool = False
+    # (text, case, position) tuples, materialized as VerbPreposition in to_model
+    verb_prepositions: Optional[List[Tuple[str, str, int]]] = None
+    linked_verb: Optional[int] = None
+    governs_case: Optional[str] = None
+
+    def to_model(self) -> Token:
+        """Convert to a Token model without re-validating the fields."""
+        return Token.model_construct(
+            text=self.text,
+            pos=self.pos,
+            lemma=self.lemma,
+            start=self.start,
+            end=self.end,
+            is_separable=self.is_separable,
+            separable_parts=self.separable_parts,
+            paired_with=self.paired_with,
+            is_reflexive=self.is_reflexive,
+            verb_prepositions=[
+                VerbPreposition.model_construct(text=text, case=case, position=position)
+                for text, case, position in self.verb_prepositions
+            ] if self.verb_prepositions else None,
+            linked_verb=self.linked_verb,
+            governs_case=self.governs_case
+        )
+
+
 class AnalyzeResponse(BaseModel):
     """Response model containing POS analysis results."""
     tokens: List[Token]
+    # Only present when the request gave a target_position inside a token
+    target_index: Optional[int] = None  # Index of the token at target_position
+    paired_indices: Optional[List[int]] = None  # Indices of the target's paired tokens
+
+
+class AnalyzeBatchResponse(BaseModel):
+    """Response model containing one analysis result per input text."""
+    results: List[AnalyzeResponse]
 
 
 class POSCategory(BaseModel):
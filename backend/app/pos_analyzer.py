@@ -1,14 +1,28 @@
 """Core POS analysis using spaCy for German text."""
+import numpy as np
 import spacy
-from typing import List, Optional
+from spacy.attrs import IDX, LEMMA, POS
+from spacy.parts_of_speech import IDS as POS_IDS
+from spacy.symbols import AUX, VERB
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 import logging
+import os
+import sys
 
-from .models import Token, VerbPreposition
-from .separable_verbs import SeparableVerbDetector
-from .verb_prepositions import VerbPrepositionDetector
+from .models import TokenData
+from .separable_verbs import ReflexivePair, SeparablePair, SeparableVerbDetector
+from .token_builder import build_token_list
+from .verb_prepositions import PrepositionMatch, VerbPrepositionDetector
 
 logger = logging.getLogger(__name__)
 
+# Bounds for automatically chosen nlp.pipe batch sizes (tuning guidance, not a
+# measured optimum: tiny batches add per-batch overhead, huge ones delay the
+# first results and raise peak memory; adjust for the deployment's workload)
+PIPE_BATCH_SIZE_MIN = 35
+PIPE_BATCH_SIZE_MAX = 85
+PIPE_BATCH_SIZE_DEFAULT = 64
+
 
 class POSAnalyzer:
     """Analyzes German text and returns POS tags using spaCy."""
@@ -22,8 +36,12 @@ class POSAnalyzer:
             # Speed optimizations: small clauses + disabled NER + caching = still fast
             self.nlp = spacy.load("de_core_news_lg", disable=["ner"])
             # Initialize verb detectors
-            self.verb_detector = SeparableVerbDetector()
+            self.verb_detector = SeparableVerbDetector(self.nlp.vocab)
             self.prep_detector = VerbPrepositionDetector()
+            # POS symbol ids used to pre-filter verb tokens with doc.to_array
+            self.verb_pos_ids = np.array([VERB, AUX], dtype=np.uint64)
+            # POS symbol id -> tag name (e.g. 100 -> "VERB"), same strings as token.pos_
+            self.pos_names = {pos_id: name for name, pos_id in POS_IDS.items()}
             logger.info("spaCy model loaded successfully")
         except OSError:
             logger.error("German spaCy model not found. Please run: python -m spacy download de_core_news_lg")
@@ -34,7 +52,7 @@ class POSAnalyzer:
         text: str,
         target_word: Optional[str] = None,
         target_position: Optional[int] = None
-    ) -> List[Token]:
+    ) -> List[TokenData]:
         """
         Analyze German text and return structured POS data.
 
@@ -44,7 +62,7 @@ class POSAnalyzer:
             target_position: Character position of the target word (optional)
 
         Returns:
-            List of Token objects with POS information
+            List of TokenData objects with POS information
         """
         if not text or not text.strip():
             return []
@@ -52,18 +70,176 @@ class POSAnalyzer:
         # Process text with spaCy
         doc = self.nlp(text)
 
+        return self._analyze_doc(doc)
+
+    def analyze_texts(
+        self,
+        texts: List[str],
+        batch_size: int = 32,
+        n_process: int = 1
+    ) -> List[List[TokenData]]:
+        """
+        Analyze several German texts in one batched spaCy call.
+
+        Args:
+            texts: The German texts to analyze
+            batch_size: Number of texts spaCy processes per internal batch
+            n_process: Number of worker processes for nlp.pipe (-1 uses all cores)
+
+        Returns:
+            List of TokenData lists, one per input text (in the same order)
+        """
+        results: List[List[TokenData]] = [[] for _ in texts]
+        indices = [i for i, text in enumerate(texts) if text and text.strip()]
+
+        # nlp.pipe amortizes the per-call pipeline overhead across the batch
+        docs = self._pipe(
+            (texts[i] for i in indices), n_process=n_process, batch_size=batch_size
+        )
+        for i, doc in zip(indices, docs):
+            results[i] = self._analyze_doc(doc)
+
+        return results
+
+    def process_texts(
+        self,
+        texts: Iterable[str],
+        n_process: int = -1,
+        batch_size: Optional[int] = None
+    ) -> Iterator[Tuple]:
+        """
+        Run the verb detectors over a stream of texts processed in batches.
+
+        Intended for bulk/offline work: spaCy parses the texts with nlp.pipe
+        across worker processes and the detectors run on each Doc as it arrives.
+
+        Args:
+            texts: The German texts to analyze
+            n_process: Number of worker processes for nlp.pipe (-1 uses all cores;
+                       pass 1 when running the model on a GPU)
+            batch_size: Number of texts per batch (default: tuned to the input size)
+
+        Yields:
+            (doc, separable_pairs, reflexive_pairs, verb_prep_map) tuples, in input order
+        """
+        if batch_size is None:
+            batch_size = self._auto_batch_size(texts, n_process)
+
+        for doc in self._pipe(texts, n_process=n_process, batch_size=batch_size):
+            verb_tokens = self._verb_tokens(doc, doc.to_array([POS]))
+            yield (doc, *self._detect_constructions(doc, verb_tokens))
+
+    def _pipe(self, texts: Iterable[str], n_process: int, batch_size: int):
+        """Run nlp.pipe, warning when multiprocessing will be expensive."""
+        if n_process != 1 and sys.platform == "win32":
+            # Windows spawns fresh interpreters that each reload the model
+            logger.warning(
+                "nlp.pipe with n_process=%d on Windows has high process startup cost", n_process
+            )
+        return self.nlp.pipe(texts, n_process=n_process, batch_size=batch_size)
+
+    @staticmethod
+    def _auto_batch_size(texts: Iterable[str], n_process: int) -> int:
+        """
+        Pick an nlp.pipe batch size for the input.
+
+        Splits sized inputs evenly across the worker processes, clamped to
+        PIPE_BATCH_SIZE_MIN..PIPE_BATCH_SIZE_MAX; unsized iterables get the default.
+        """
+        if not hasattr(texts, "__len__"):
+            return PIPE_BATCH_SIZE_DEFAULT
+        workers = n_process if n_process > 0 else (os.cpu_count() or 1)
+        per_worker = -(-len(texts) // workers)
+        return min(max(per_worker, PIPE_BATCH_SIZE_MIN), PIPE_BATCH_SIZE_MAX)
+
+    def _verb_tokens(self, doc, pos_ids) -> list:
+        """
+        Find VERB/AUX tokens in one vectorized pass over the POS ids.
+
+        Args:
+            doc: spaCy Doc object
+            pos_ids: Array of POS ids for the Doc's tokens (first column of to_array)
+
+        Returns:
+            List of VERB/AUX tokens in document order
+        """
+        if pos_ids.ndim > 1:
+            pos_ids = pos_ids[:, 0]
+        return [doc[i] for i in np.flatnonzero(np.isin(pos_ids, self.verb_pos_ids)).tolist()]
+
+    def _analyze_doc(self, doc) -> List[TokenData]:
+        """
+        Convert a processed spaCy Doc into structured POS data.
+
+        Args:
+            doc: spaCy Doc object
+
+        Returns:
+            List of TokenData objects with POS information
+        """
+        # Snapshot POS, lemma and offset ids in one bulk copy instead of per-token accessors
+        attrs = doc.to_array([POS, LEMMA, IDX])
+        pos_ids, lemma_ids, offsets = attrs.T.tolist()
+        strings = doc.vocab.strings
+
+        separable_pairs, reflexive_pairs, verb_prep_map = self._detect_constructions(
+            doc, self._verb_tokens(doc, attrs[:, 0])
+        )
+
+        # Reverse mapping: preposition position -> (verb position, case)
+        prep_verb_map = {}
+        for verb_i, preps in verb_prep_map.items():
+            verb_idx = offsets[verb_i]
+            for prep_info in preps:
+                prep_verb_map[prep_info.position] = (verb_idx, prep_info.case)
+
+        # Index pair information by token position for O(1) lookups
+        separable_by_idx = self._index_separable_pairs(separable_pairs)
+        reflexive_by_idx = self._index_reflexive_pairs(reflexive_pairs)
+
+        # Convert spaCy tokens to our TokenData records
+        pos_names = self.pos_names
+        return build_token_list(
+            texts=[token.text for token in doc],
+            pos_tags=[pos_names[pos_id] for pos_id in pos_ids],
+            lemmas=[strings[lemma_id] for lemma_id in lemma_ids],
+            offsets=offsets,
+            separable_by_idx=separable_by_idx,
+            reflexive_by_idx=reflexive_by_idx,
+            verb_prep_map=verb_prep_map,
+            prep_verb_map=prep_verb_map
+        )
+
+    def _detect_constructions(
+        self, doc, verb_tokens: list
+    ) -> Tuple[List[SeparablePair], List[ReflexivePair], Dict[int, List[PrepositionMatch]]]:
+        """
+        Run the separable, reflexive and verb-preposition detectors on a Doc.
+
+        Args:
+            doc: spaCy Doc object
+            verb_tokens: The Doc's VERB/AUX tokens
+
+        Returns:
+            (separable_pairs, reflexive_pairs, verb_prep_map), where verb_prep_map
+            maps verb token index to its list of preposition info
+        """
+        # Index preposition candidates per sentence once, shared by every verb lookup
+        prep_index = self.prep_detector.index_prepositions(doc)
+
         # Detect verb-preposition combinations FIRST
         # This prevents prepositions from being misidentified as separable particles
-        verb_prep_positions = set()  # Track which positions are verb-linked prepositions
+        verb_prep_positions = np.zeros(len(doc), dtype=bool)  # Marks verb-linked prepositions
 
         temp_verb_preps = {}
-        for token in doc:
-            if token.pos_ in ['VERB', 'AUX']:
-                preps = self.prep_detector.detect_verb_prepositions(doc, token, token.lemma_)
-                if preps:
-                    temp_verb_preps[token.i] = preps
-                    for prep_info in preps:
-                        verb_prep_positions.add(prep_info['preposition'].i)
+        for token in verb_tokens:
+            preps = self.prep_detector.detect_verb_prepositions(
+                doc, token, token.lemma_, prep_index
+            )
+            if preps:
+                temp_verb_preps[token.i] = preps
+                for prep_info in preps:
+                    verb_prep_positions[prep_info.preposition.i] = True
 
         # Detect separable verbs (exclude positions that are verb-linked prepositions)
         separable_pairs = self.verb_detector.detect_separable_verbs(doc, verb_prep_positions)
@@ -74,198 +250,91 @@ class POSAnalyzer:
         # Create a map of verb positions to their full infinitive forms (for separable/reflexive verbs)
         verb_infinitives = {}  # Maps verb token index to infinitive form
         for pair in separable_pairs:
-            verb_infinitives[pair['verb'].i] = pair['lemma']
+            verb_infinitives[pair.verb.i] = pair.lemma
         for pair in reflexive_pairs:
-            verb_infinitives[pair['verb'].i] = pair['lemma']
+            verb_infinitives[pair.verb.i] = pair.lemma
 
         # Re-detect verb-preposition combinations with correct infinitive forms
         # (Now that we know the full infinitives for separable/reflexive verbs)
+        # Only verbs whose lemma changed need a second pass; the rest reuse the first one
         verb_prep_map = {}  # Maps verb token index to list of preposition info
-        prep_verb_map = {}  # Maps preposition position to (verb_position, case)
-
-        for token in doc:
-            if token.pos_ in ['VERB', 'AUX']:
-                # Use the full infinitive if available (for separable/reflexive verbs)
-                verb_lemma = verb_infinitives.get(token.i, token.lemma_)
-                preps = self.prep_detector.detect_verb_prepositions(doc, token, verb_lemma)
-                if preps:
-                    verb_prep_map[token.i] = preps
-                    # Also create reverse mapping for preposition tokens
-                    for prep_info in preps:
-                        prep_verb_map[prep_info['position']] = (token.idx, prep_info['case'])
-
-        # Convert spaCy tokens to our Token model
-        tokens = []
-        for token in doc:
-            # Check if this token is part of a separable verb
-            separable_info = self._get_separable_info(token, separable_pairs)
-
-            # Check if this token is part of a reflexive verb
-            reflexive_info = self._get_reflexive_info(token, reflexive_pairs)
-
-            # Determine POS tag (use VERB_PARTICLE for separable particles)
-            pos_tag = token.pos_
-            if separable_info and separable_info.get('is_particle'):
-                pos_tag = "VERB_PARTICLE"
-
-            # Get is_separable flag and related info
-            is_separable = False
-            separable_parts = []
-            paired_with = []
-            is_reflexive = False
-            lemma = token.lemma_
-
-            if separable_info:
-                is_separable = separable_info.get('is_separable', False)
-                parts = separable_info.get('parts')
-                if parts:
-                    separable_parts.extend(parts)
-                paired_pos = separable_info.get('paired_with')
-                if paired_pos is not None:
-                    paired_with.append(paired_pos)
-                if 'lemma' in separable_info:
-                    lemma = separable_info['lemma']
-
-            if reflexive_info:
-                is_reflexive = reflexive_info.get('is_reflexive', False)
-                if 'lemma' in reflexive_info:
-                    # For reflexive + separable, combine lemmas
-                    if is_separable:
-                        lemma = f"sich {separable_info['lemma']}"
-                    else:
-                        lemma = reflexive_info['lemma']
-                parts = reflexive_info.get('parts')
-                if parts:
-                    # Add reflexive parts that aren't already in separable_parts
-                    for part in parts:
-                        if part not in separable_parts:
-                            separable_parts.append(part)
-                paired_pos = reflexive_info.get('paired_with')
-                if paired_pos is not None:
-                    paired_with.append(paired_pos)
-
-            # Convert to None if empty
-            separable_parts = separable_parts if separable_parts else None
-            paired_with = paired_with if paired_with else None
-
-            # Add verb-preposition information
-            verb_prepositions = None
-            linked_verb = None
-            governs_case = None
-
-            # If this is a verb, check if it has prepositions
-            if token.i in verb_prep_map:
-                verb_prepositions = [
-                    VerbPreposition(
-                        text=prep_info['preposition'].text,
-                        case=prep_info['case'],
-                        position=prep_info['position']
-                    )
-                    for prep_info in verb_prep_map[token.i]
-                ]
-                # Add preposition positions to paired_with for highlighting
-                if paired_with is None:
-                    paired_with = []
-                for prep_info in verb_prep_map[token.i]:
-                    paired_with.append(prep_info['position'])
-
-            # If this is a preposition linked to a verb
-            if token.idx in prep_verb_map:
-                linked_verb, governs_case = prep_verb_map[token.idx]
-                # Add verb position to paired_with for highlighting
-                if paired_with is None:
-                    paired_with = []
-                paired_with.append(linked_verb)
-
-            token_data = Token(
-                text=token.text,
-                pos=pos_tag,
-                lemma=lemma,
-                start=token.idx,
-                end=token.idx + len(token.text),
-                is_separable=is_separable,
-                separable_parts=separable_parts,
-                paired_with=paired_with,
-                is_reflexive=is_reflexive,
-                verb_prepositions=verb_prepositions,
-                linked_verb=linked_verb,
-                governs_case=governs_case
-            )
-            tokens.append(token_data)
-
-        return tokens
 
-    def _get_separable_info(self, token, separable_pairs: List[dict]) -> Optional[dict]:
+        for token in verb_tokens:
+            # Use the full infinitive if available (for separable/reflexive verbs)
+            verb_lemma = verb_infinitives.get(token.i, token.lemma_)
+            if verb_lemma == token.lemma_:
+                preps = temp_verb_preps.get(token.i)
+            else:
+                preps = self.prep_detector.detect_verb_prepositions(
+                    doc, token, verb_lemma, prep_index
+                )
+            if preps:
+                verb_prep_map[token.i] = preps
+
+        return separable_pairs, reflexive_pairs, verb_prep_map
+
+    def _index_separable_pairs(self, separable_pairs: List[SeparablePair]) -> Dict[int, dict]:
         """
-        Get separable verb information for a token.
+        Index separable verb information by token position.
 
         Args:
-            token: spaCy token
             separable_pairs: List of detected separable verb pairs
 
         Returns:
-            Dictionary with separable verb info or None
+            Dictionary mapping token index to separable verb info
         """
+        separable_by_idx = {}
         for pair in separable_pairs:
-            verb_token = pair['verb']
-            particle_token = pair['particle']
-            lemma = pair['lemma']
-
-            if token.i == verb_token.i:
-                # This is the verb part
-                return {
-                    'is_separable': True,
-                    'is_particle': False,
-                    'parts': [verb_token.text, particle_token.text],
-                    'paired_with': particle_token.idx,
-                    'lemma': lemma
-                }
-            elif token.i == particle_token.i:
-                # This is the particle part
-                return {
-                    'is_separable': True,
-                    'is_particle': True,
-                    'parts': [verb_token.text, particle_token.text],
-                    'paired_with': verb_token.idx,
-                    'lemma': lemma
-                }
-
-        return None
-
-    def _get_reflexive_info(self, token, reflexive_pairs: List[dict]) -> Optional[dict]:
+            verb_token, particle_token, lemma = pair
+            parts = [verb_token.text, particle_token.text]
+
+            # setdefault keeps the first pair that mentions a token
+            separable_by_idx.setdefault(verb_token.i, {
+                'is_separable': True,
+                'is_particle': False,
+                'parts': parts,
+                'paired_with': particle_token.idx,
+                'lemma': lemma
+            })
+            separable_by_idx.setdefault(particle_token.i, {
+                'is_separable': True,
+                'is_particle': True,
+                'parts': parts,
+                'paired_with': verb_token.idx,
+                'lemma': lemma
+            })
+
+        return separable_by_idx
+
+    def _index_reflexive_pairs(self, reflexive_pairs: List[ReflexivePair]) -> Dict[int, dict]:
         """
-        Get reflexive verb information for a token.
+        Index reflexive verb information by token position.
 
         Args:
-            token: spaCy token
             reflexive_pairs: List of detected reflexive verb pairs
 
         Returns:
-            Dictionary with reflexive verb info or None
+            Dictionary mapping token index to reflexive verb info
         """
+        reflexive_by_idx = {}
         for pair in reflexive_pairs:
-            verb_token = pair['verb']
-            pronoun_token = pair['pronoun']
-            lemma = pair['lemma']
-
-            if token.i == verb_token.i:
-                # This is the verb part
-                return {
-                    'is_reflexive': True,
-                    'parts': [verb_token.text, pronoun_token.text],
-                    'paired_with': pronoun_token.idx,
-                    'lemma': lemma
-                }
-            elif token.i == pronoun_token.i:
-                # This is the pronoun part
-                return {
-                    'is_reflexive': True,
-                    'parts': [verb_token.text, pronoun_token.text],
-                    'paired_with': verb_token.idx,
-                    'lemma': lemma
-                }
-
-        return None
+            verb_token, pronoun_token, lemma = pair
+            parts = [verb_token.text, pronoun_token.text]
+
+            reflexive_by_idx.setdefault(verb_token.i, {
+                'is_reflexive': True,
+                'parts': parts,
+                'paired_with': pronoun_token.idx,
+                'lemma': lemma
+            })
+            reflexive_by_idx.setdefault(pronoun_token.i, {
+                'is_reflexive': True,
+                'parts': parts,
+                'paired_with': verb_token.idx,
+                'lemma': lemma
+            })
+
+        return reflexive_by_idx
 
     def get_sentence_context(self, doc, token_index: int, max_chars: int = 300) -> str:
         """
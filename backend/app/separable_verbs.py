@@ -1,42 +1,139 @@
 """German separable verb detection using dependency parsing."""
-from typing import List, Dict
+from bisect import bisect_left
+import numpy as np
+from spacy.matcher import Matcher
+from spacy.symbols import ADP, ADV, AUX, DET, NOUN, PRON, PROPN, VERB
+from typing import Any, Dict, List, NamedTuple, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+class SeparablePair(NamedTuple):
+    """A separable verb linked to its particle."""
+    verb: Any  # spaCy Token
+    particle: Any  # spaCy Token
+    lemma: str  # Full infinitive (e.g., "aufstehen")
+
+
+class ReflexivePair(NamedTuple):
+    """A reflexive verb linked to its pronoun."""
+    verb: Any  # spaCy Token
+    pronoun: Any  # spaCy Token
+    lemma: str  # Infinitive with "sich" (e.g., "sich freuen")
+
+
+# Pronominal adverbs that should NOT be treated as separable prefixes
+# These contain prepositions and are handled by VerbPrepositionDetector
+_PRONOMINAL_ADVERBS = frozenset({
+    'daran', 'darauf', 'daraus', 'darin', 'damit', 'danach', 'davon',
+    'davor', 'dazu', 'darüber', 'darunter', 'dagegen', 'dafür', 'dabei',
+    'woran', 'worauf', 'woraus', 'worin', 'womit', 'wonach', 'wovon',
+    'wovor', 'wozu', 'worüber', 'worunter', 'wogegen', 'wofür', 'wobei',
+})
+
+# Common German separable verb prefixes
+_SEPARABLE_PREFIXES = frozenset({
+    'ab', 'an', 'auf', 'aus', 'bei', 'ein', 'mit',
+    'nach', 'vor', 'zu', 'zurück', 'weg', 'her', 'hin',
+    # Note: 'da' removed - it's part of pronominal adverbs (damit, daran, etc.)
+    'empor', 'entgegen', 'entlang', 'fort', 'gegenüber',
+    'heim', 'herab', 'heran', 'herauf', 'heraus', 'herbei',
+    'herein', 'herüber', 'herum', 'herunter', 'hervor',
+    'hinab', 'hinauf', 'hinaus', 'hinein', 'hinüber',
+    'hinunter', 'los', 'nieder', 'voran', 'voraus',
+    'vorbei', 'vorüber', 'weiter', 'zusammen',
+    'fest'  # festlegen, feststellen, festhalten, festnehmen, etc.
+})
+
+# Reflexive pronouns in German
+_REFLEXIVE_PRONOUNS = frozenset({
+    'sich', 'mich', 'dich', 'uns', 'euch', 'mir', 'dir'
+})
+
+# POS symbol ids of verbs (main and auxiliary)
+_VERB_POS = frozenset({VERB, AUX})
+
+# POS symbol ids that start a noun phrase (a particle followed by one is a preposition)
+_NOUN_PHRASE_POS = frozenset({DET, PRON, NOUN, PROPN})
+
+
+class _MatcherTables(NamedTuple):
+    """StringStore ids and Matchers resolved for one vocab."""
+    vocab: Any  # spaCy Vocab the Matchers were built for
+    svp_id: int
+    pronominal_ids: frozenset
+    prefix_matcher: Any  # spaCy Matcher for separable particle candidates
+    reflexive_matcher: Any  # spaCy Matcher for reflexive pronoun candidates
+
+
 class SeparableVerbDetector:
     """Detects and links separable verb parts and reflexive verbs in German text."""
 
-    # Pronominal adverbs that should NOT be treated as separable prefixes
-    # These contain prepositions and are handled by VerbPrepositionDetector
-    PRONOMINAL_ADVERBS = {
-        'daran', 'darauf', 'daraus', 'darin', 'damit', 'danach', 'davon',
-        'davor', 'dazu', 'darüber', 'darunter', 'dagegen', 'dafür', 'dabei',
-        'woran', 'worauf', 'woraus', 'worin', 'womit', 'wonach', 'wovon',
-        'wovor', 'wozu', 'worüber', 'worunter', 'wogegen', 'wofür', 'wobei',
-    }
-
-    # Common German separable verb prefixes
-    SEPARABLE_PREFIXES = {
-        'ab', 'an', 'auf', 'aus', 'bei', 'ein', 'mit',
-        'nach', 'vor', 'zu', 'zurück', 'weg', 'her', 'hin',
-        # Note: 'da' removed - it's part of pronominal adverbs (damit, daran, etc.)
-        'empor', 'entgegen', 'entlang', 'fort', 'gegenüber',
-        'heim', 'herab', 'heran', 'herauf', 'heraus', 'herbei',
-        'herein', 'herüber', 'herum', 'herunter', 'hervor',
-        'hinab', 'hinauf', 'hinaus', 'hinein', 'hinüber',
-        'hinunter', 'los', 'nieder', 'voran', 'voraus',
-        'vorbei', 'vorüber', 'weiter', 'zusammen',
-        'fest'  # festlegen, feststellen, festhalten, festnehmen, etc.
-    }
-
-    # Reflexive pronouns in German
-    REFLEXIVE_PRONOUNS = {
-        'sich', 'mich', 'dich', 'uns', 'euch', 'mir', 'dir'
-    }
-
-    def detect_separable_verbs(self, doc, exclude_positions=None) -> List[Dict]:
+    # Class-level aliases of the module constants (hot loops use the module names)
+    PRONOMINAL_ADVERBS = _PRONOMINAL_ADVERBS
+    SEPARABLE_PREFIXES = _SEPARABLE_PREFIXES
+    REFLEXIVE_PRONOUNS = _REFLEXIVE_PRONOUNS
+
+    def __init__(self, vocab=None):
+        """
+        Initialize the detector.
+
+        Args:
+            vocab: Optional spaCy Vocab of the Docs to analyze; when given, the
+                   Matchers are built up front instead of on the first Doc
+        """
+        # StringStore ids and Matchers for the word lists, published as one tuple
+        # so concurrent callers never see a partially built set
+        self._tables = self._build_tables(vocab) if vocab is not None else None
+
+    def _tables_for(self, vocab) -> "_MatcherTables":
+        """Return the id tables and Matchers for a vocab, building them if needed."""
+        tables = self._tables
+        if tables is None or tables.vocab is not vocab:
+            tables = self._build_tables(vocab)
+            self._tables = tables
+        return tables
+
+    @staticmethod
+    def _build_tables(vocab) -> "_MatcherTables":
+        """
+        Resolve the word lists to StringStore ids and Matchers for a vocab.
+
+        The Matchers find candidate particles/pronouns in spaCy's compiled
+        matching loop, so only the matched tokens reach the Python checks,
+        which compare token.lower / token.dep integer ids directly.
+        """
+        strings = vocab.strings
+
+        # Separable prefixes marked "svp" or tagged ADP/ADV (possible mislabeled particles)
+        prefixes = sorted(_SEPARABLE_PREFIXES)
+        prefix_matcher = Matcher(vocab)
+        prefix_matcher.add("SEPARABLE_PARTICLE", [
+            [{"LOWER": {"IN": prefixes}, "DEP": "svp"}],
+            [{"LOWER": {"IN": prefixes}, "POS": {"IN": ["ADP", "ADV"]}}],
+        ])
+
+        reflexive_matcher = Matcher(vocab)
+        reflexive_matcher.add("REFLEXIVE_PRONOUN", [
+            [{"LOWER": {"IN": sorted(_REFLEXIVE_PRONOUNS)}, "POS": "PRON"}],
+        ])
+
+        return _MatcherTables(
+            vocab=vocab,
+            svp_id=strings["svp"],
+            pronominal_ids=frozenset(strings[word] for word in _PRONOMINAL_ADVERBS),
+            prefix_matcher=prefix_matcher,
+            reflexive_matcher=reflexive_matcher,
+        )
+
+    @staticmethod
+    def _matched_tokens(matcher, doc) -> list:
+        """Return the tokens matched by a single-token Matcher, in document order."""
+        # A token can match more than one pattern, so dedupe the start positions
+        return [doc[i] for i in sorted({start for _, start, _ in matcher(doc)})]
+
+    def detect_separable_verbs(self, doc, exclude_positions=None) -> List[SeparablePair]:
         """
         Detect separable verb pairs in a spaCy Doc.
 
@@ -45,78 +142,86 @@ class SeparableVerbDetector:
 
         Args:
             doc: spaCy Doc object
-            exclude_positions: Set of token positions to exclude (e.g., verb-linked prepositions)
+            exclude_positions: Token positions to exclude (e.g., verb-linked prepositions), either
+                               a boolean mask of length len(doc) or an iterable of indices
 
         Returns:
-            List of dictionaries containing verb-particle pairs:
-            [{'verb': verb_token, 'particle': particle_token, 'lemma': infinitive_form}, ...]
+            List of SeparablePair(verb, particle, lemma) tuples
         """
-        if exclude_positions is None:
-            exclude_positions = set()
-
-        separable_pairs = []
-
-        for token in doc:
-            # Skip if this position is a verb-linked preposition
-            if token.i in exclude_positions:
+        excluded = self._exclusion_mask(doc, exclude_positions).tolist()
+
+        # Pairs found via the "svp" dependency take precedence over heuristic
+        # ADP/ADV matches, so collect them separately and join them at the end
+        svp_pairs = []
+        fallback_pairs = []
+        tables = self._tables_for(doc.vocab)
+        svp_id = tables.svp_id
+        pronominal_ids = tables.pronominal_ids
+        particle_pos = (ADP, ADV)
+        verbs_by_sent = {}  # Sentence start -> its verbs, shared by every fallback lookup
+
+        # The matcher only yields separable prefixes that are "svp" or ADP/ADV
+        for token in self._matched_tokens(tables.prefix_matcher, doc):
+            # Skip positions that are verb-linked prepositions and
+            # pronominal adverbs (they're handled by VerbPrepositionDetector)
+            if excluded[token.i] or token.lower in pronominal_ids:
                 continue
 
             # spaCy marks separable verb particles with dependency relation "svp"
-            if token.dep_ == "svp":
-                # Skip pronominal adverbs (they're handled by VerbPrepositionDetector)
-                if token.text.lower() in self.PRONOMINAL_ADVERBS:
-                    continue
-
+            if token.dep == svp_id:
                 # The head of the particle is the verb
                 verb = token.head
+                pairs = svp_pairs
 
-                # Verify that the particle is actually a known separable prefix
-                if self._is_separable_prefix(token.text.lower()):
-                    # Get the lemma (infinitive form) of the verb
-                    # For separable verbs, we want to combine particle + verb lemma
-                    lemma = self._construct_infinitive(token.text, verb.lemma_)
-
-                    separable_pairs.append({
-                        'verb': verb,
-                        'particle': token,
-                        'lemma': lemma
-                    })
-
-                    logger.debug(
-                        f"Found separable verb: {verb.text} ... {token.text} "
-                        f"(lemma: {lemma})"
-                    )
-
-        # Also check for particles that might be ADP (adpositions) or ADV (adverbs)
-        # but actually function as verb particles
-        # This catches cases where spaCy mislabels the dependency or POS
-        for token in doc:
-            # Skip if this position is a verb-linked preposition
-            if token.i in exclude_positions:
-                continue
+            # Also check for particles that might be ADP (adpositions) or ADV (adverbs)
+            # but actually function as verb particles
+            # This catches cases where spaCy mislabels the dependency or POS
+            elif token.pos in particle_pos:
+                # Look for nearby verbs that this could be paired with
+                verb = self._find_paired_verb(token, doc, verbs_by_sent)
+                if not verb:
+                    continue
+                pairs = fallback_pairs
 
-            # Skip pronominal adverbs
-            if token.text.lower() in self.PRONOMINAL_ADVERBS:
+            else:
                 continue
 
-            if token.pos_ in ["ADP", "ADV"] and self._is_separable_prefix(token.text.lower()):
-                # Look for nearby verbs that this could be paired with
-                verb = self._find_paired_verb(token, doc)
-                if verb and not self._already_paired(verb, token, separable_pairs):
-                    lemma = self._construct_infinitive(token.text, verb.lemma_)
-                    separable_pairs.append({
-                        'verb': verb,
-                        'particle': token,
-                        'lemma': lemma
-                    })
-                    logger.debug(
-                        f"Found separable verb ({token.pos_}): {verb.text} ... {token.text} "
-                        f"(lemma: {lemma})"
-                    )
+            # Get the lemma (infinitive form) of the verb
+            # For separable verbs, we want to combine particle + verb lemma
+            lemma = self._construct_infinitive(token.text, verb.lemma_)
+            pairs.append(SeparablePair(verb, token, lemma))
+
+            logger.debug(
+                "Found separable verb (%s/%s): %s ... %s (lemma: %s)",
+                token.dep_, token.pos_, verb.text, token.text, lemma,
+            )
+
+        separable_pairs = svp_pairs + fallback_pairs
 
         return separable_pairs
 
-    def detect_reflexive_verbs(self, doc) -> List[Dict]:
+    @staticmethod
+    def _exclusion_mask(doc, exclude_positions) -> np.ndarray:
+        """
+        Normalize excluded token positions to a boolean mask over the Doc.
+
+        Args:
+            doc: spaCy Doc object
+            exclude_positions: None, a boolean mask, or an iterable of token indices
+
+        Returns:
+            Boolean array of length len(doc), True at excluded positions
+        """
+        if isinstance(exclude_positions, np.ndarray) and exclude_positions.dtype == np.bool_:
+            return exclude_positions
+        mask = np.zeros(len(doc), dtype=bool)
+        if exclude_positions is not None:
+            # Index arrays, sets and lists alike (truthiness is ambiguous for arrays)
+            positions = np.fromiter(exclude_positions, dtype=np.intp)
+            mask[positions] = True
+        return mask
+
+    def detect_reflexive_verbs(self, doc) -> List[ReflexivePair]:
         """
         Detect reflexive verb pairs in a spaCy Doc.
 
@@ -127,71 +232,88 @@ class SeparableVerbDetector:
             doc: spaCy Doc object
 
         Returns:
-            List of dictionaries containing verb-pronoun pairs:
-            [{'verb': verb_token, 'pronoun': pronoun_token, 'lemma': infinitive_form}, ...]
+            List of ReflexivePair(verb, pronoun, lemma) tuples
         """
         reflexive_pairs = []
+        tables = self._tables_for(doc.vocab)
+        verbs_by_sent = {}  # Sentence start -> its verbs, shared by every pronoun lookup
+
+        # The matcher only yields reflexive pronouns tagged PRON
+        for token in self._matched_tokens(tables.reflexive_matcher, doc):
+            # Find the verb this pronoun is attached to
+            # Common dependencies: 'expl' (expletive), 'obj' (object), 'dobj' (direct object)
+            verb = None
 
-        for token in doc:
-            # Check if token is a reflexive pronoun
-            if token.pos_ == "PRON" and token.text.lower() in self.REFLEXIVE_PRONOUNS:
-                # Find the verb this pronoun is attached to
-                # Common dependencies: 'expl' (expletive), 'obj' (object), 'dobj' (direct object)
-                verb = None
-
-                # First, check if the pronoun's head is a verb
-                if token.head.pos_ in ["VERB", "AUX"]:
-                    verb = token.head
-                else:
-                    # Otherwise, look for the closest verb in the sentence
-                    verb = self._find_verb_for_pronoun(token)
-
-                if verb:
-                    # Construct lemma with 'sich' as the standard reflexive pronoun
-                    lemma = f"sich {verb.lemma_}"
-
-                    reflexive_pairs.append({
-                        'verb': verb,
-                        'pronoun': token,
-                        'lemma': lemma
-                    })
-
-                    logger.debug(
-                        f"Found reflexive verb: {verb.text} {token.text} "
-                        f"(lemma: {lemma})"
-                    )
+            # First, check if the pronoun's head is a verb
+            if token.head.pos in _VERB_POS:
+                verb = token.head
+            else:
+                # Otherwise, look for the closest verb in the sentence
+                verb = self._find_verb_for_pronoun(token, verbs_by_sent)
+
+            if verb:
+                # Construct lemma with 'sich' as the standard reflexive pronoun
+                lemma = f"sich {verb.lemma_}"
+
+                reflexive_pairs.append(ReflexivePair(verb, token, lemma))
+
+                logger.debug(
+                    "Found reflexive verb: %s %s (lemma: %s)",
+                    verb.text, token.text, lemma,
+                )
 
         return reflexive_pairs
 
-    def _find_verb_for_pronoun(self, pronoun_token) -> any:
+    def _find_verb_for_pronoun(self, pronoun_token, verbs_by_sent: Optional[Dict[int, tuple]] = None) -> any:
         """
         Find the verb associated with a reflexive pronoun.
 
         Args:
             pronoun_token: The reflexive pronoun token
+            verbs_by_sent: Optional per-Doc cache of verbs by sentence start
 
         Returns:
             The associated verb token or None
         """
-        sentence = pronoun_token.sent
+        # Prefer the closest verb in the sentence (usually the main verb of the clause)
+        return self._find_closest_verb(pronoun_token, verbs_by_sent)
 
-        # Look for verbs in the same sentence
-        verbs_in_sentence = [token for token in sentence if token.pos_ in ["VERB", "AUX"]]
+    def _find_closest_verb(self, target_token, verbs_by_sent: Optional[Dict[int, tuple]] = None) -> any:
+        """
+        Find the verb closest to a token within its sentence.
 
-        if not verbs_in_sentence:
-            return None
+        Binary search over the sentence's verb indices; on ties the earlier verb wins.
 
-        # Prefer the closest verb (usually the main verb of the clause)
-        closest_verb = min(
-            verbs_in_sentence,
-            key=lambda v: abs(v.i - pronoun_token.i)
-        )
+        Args:
+            target_token: The token to measure distance from
+            verbs_by_sent: Optional per-Doc cache of (verb indices, verbs) by sentence
+                           start, so several lookups in one sentence scan it only once
 
-        return closest_verb
+        Returns:
+            The closest VERB/AUX token or None if the sentence has none
+        """
+        sentence = target_token.sent
+        cached = verbs_by_sent.get(sentence.start) if verbs_by_sent is not None else None
+        if cached is None:
+            verbs = [token for token in sentence if token.pos in _VERB_POS]
+            cached = ([token.i for token in verbs], verbs)
+            if verbs_by_sent is not None:
+                verbs_by_sent[sentence.start] = cached
+
+        verb_indices, verbs = cached
+        if not verbs:
+            return None
 
-    def _is_separable_prefix(self, text: str) -> bool:
-        """Check if text is a known separable prefix."""
-        return text.lower() in self.SEPARABLE_PREFIXES
+        # Nearest neighbours of target_i are the verbs on either side of its insertion point
+        target_i = target_token.i
+        pos = bisect_left(verb_indices, target_i)
+        if pos == 0:
+            return verbs[0]
+        if pos == len(verbs):
+            return verbs[-1]
+        if target_i - verb_indices[pos - 1] <= verb_indices[pos] - target_i:
+            return verbs[pos - 1]
+        return verbs[pos]
 
     def _construct_infinitive(self, particle: str, verb_lemma: str) -> str:
         """
@@ -208,7 +330,7 @@ class SeparableVerbDetector:
         # The verb lemma is already in infinitive form
         return f"{particle.lower()}{verb_lemma}"
 
-    def _find_paired_verb(self, particle_token, doc) -> any:
+    def _find_paired_verb(self, particle_token, doc, verbs_by_sent: Optional[Dict[int, tuple]] = None) -> any:
         """
         Find the verb that pairs with a particle.
 
@@ -221,6 +343,7 @@ class SeparableVerbDetector:
         Args:
             particle_token: The potential particle token
             doc: spaCy Doc object
+            verbs_by_sent: Optional per-Doc cache of verbs by sentence start
 
         Returns:
             The paired verb token or None
@@ -229,32 +352,14 @@ class SeparableVerbDetector:
         # If the next token is a determiner, pronoun, or noun, this is likely a preposition
         if particle_token.i + 1 < len(doc):
             next_token = doc[particle_token.i + 1]
-            if next_token.pos_ in ["DET", "PRON", "NOUN", "PROPN"]:
+            if next_token.pos in _NOUN_PHRASE_POS:
                 # This looks like a preposition (e.g., "auf das Haus")
                 # Not a separable verb particle
                 return None
 
-        sentence = particle_token.sent
-
-        # Look for verbs in the same sentence
-        verbs_in_sentence = [token for token in sentence if token.pos_ == "VERB" or token.pos_ == "AUX"]
-
-        if not verbs_in_sentence:
-            return None
-
-        # Prefer the closest verb
-        closest_verb = min(
-            verbs_in_sentence,
-            key=lambda v: abs(v.i - particle_token.i)
-        )
+        # Prefer the closest verb in the same sentence
+        closest_verb = self._find_closest_verb(particle_token, verbs_by_sent)
 
         # Additional validation: check if this could be a valid separable verb
         # by seeing if the particle is commonly used with this type of verb
         return closest_verb
-
-    def _already_paired(self, verb_token, particle_token, existing_pairs: List[Dict]) -> bool:
-        """Check if a verb-particle pair already exists in the list."""
-        for pair in existing_pairs:
-            if pair['verb'].i == verb_token.i and pair['particle'].i == particle_token.i:
-                return True
-        return False
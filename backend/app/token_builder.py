@@ -0,0 +1,129 @@
+"""Conversion of analyzed token data into TokenData records.
+
+This is the per-token hot loop of POSAnalyzer. It only works on plain
+Python values (no spaCy objects beyond the detected preposition tokens)
+and is fully annotated, so it can be compiled with mypyc without changes.
+"""
+import sys
+from typing import Any, Dict, List, Optional, Tuple, cast
+
+from .models import TokenData
+from .verb_prepositions import PrepositionMatch
+
+
+def build_token_list(
+    texts: List[str],
+    pos_tags: List[str],
+    lemmas: List[str],
+    offsets: List[int],
+    separable_by_idx: Dict[int, Dict[str, Any]],
+    reflexive_by_idx: Dict[int, Dict[str, Any]],
+    verb_prep_map: Dict[int, List[PrepositionMatch]],
+    prep_verb_map: Dict[int, Tuple[int, str]]
+) -> List[TokenData]:
+    """
+    Build TokenData records for every token of a document.
+
+    Args:
+        texts: Token texts
+        pos_tags: Token POS tags
+        lemmas: Token lemmas
+        offsets: Character offset of each token in the text
+        separable_by_idx: Separable verb info by token index
+        reflexive_by_idx: Reflexive verb info by token index
+        verb_prep_map: Preposition info by verb token index
+        prep_verb_map: (verb position, case) by preposition character position
+
+    Returns:
+        List of TokenData objects with POS information
+    """
+    tokens: List[Optional[TokenData]] = [None] * len(texts)
+    for i in range(len(texts)):
+        text = texts[i]
+        idx = offsets[i]
+
+        # Check if this token is part of a separable verb
+        separable_info = separable_by_idx.get(i)
+
+        # Check if this token is part of a reflexive verb
+        reflexive_info = reflexive_by_idx.get(i)
+
+        # Determine POS tag (use VERB_PARTICLE for separable particles)
+        pos_tag = pos_tags[i]
+        if separable_info and separable_info.get('is_particle'):
+            pos_tag = "VERB_PARTICLE"
+
+        # Get is_separable flag and related info
+        is_separable = False
+        separable_parts: List[str] = []
+        paired_with: List[int] = []
+        is_reflexive = False
+        lemma = lemmas[i]
+
+        if separable_info:
+            is_separable = separable_info.get('is_separable', False)
+            parts = separable_info.get('parts')
+            if parts:
+                separable_parts.extend(parts)
+            paired_pos = separable_info.get('paired_with')
+            if paired_pos is not None:
+                paired_with.append(paired_pos)
+            if 'lemma' in separable_info:
+                lemma = separable_info['lemma']
+
+        if reflexive_info:
+            is_reflexive = reflexive_info.get('is_reflexive', False)
+            if 'lemma' in reflexive_info:
+                # For reflexive + separable, combine lemmas
+                if separable_info and is_separable:
+                    lemma = f"sich {separable_info['lemma']}"
+                else:
+                    lemma = reflexive_info['lemma']
+            parts = reflexive_info.get('parts')
+            if parts:
+                # Add reflexive parts that aren't already in separable_parts
+                for part in parts:
+                    if part not in separable_parts:
+                        separable_parts.append(part)
+            paired_pos = reflexive_info.get('paired_with')
+            if paired_pos is not None:
+                paired_with.append(paired_pos)
+
+        # Add verb-preposition information
+        verb_prepositions: Optional[List[Tuple[str, str, int]]] = None
+        linked_verb: Optional[int] = None
+        governs_case: Optional[str] = None
+
+        # If this is a verb, check if it has prepositions
+        # (kept as tuples with interned case names until response serialization)
+        if i in verb_prep_map:
+            verb_prepositions = [
+                (prep_info.preposition.text, sys.intern(prep_info.case), prep_info.position)
+                for prep_info in verb_prep_map[i]
+            ]
+            # Add preposition positions to paired_with for highlighting
+            for prep_info in verb_prep_map[i]:
+                paired_with.append(prep_info.position)
+
+        # If this is a preposition linked to a verb
+        if idx in prep_verb_map:
+            linked_verb, governs_case = prep_verb_map[idx]
+            # Add verb position to paired_with for highlighting
+            paired_with.append(linked_verb)
+
+        tokens[i] = TokenData(
+            text=text,
+            pos=pos_tag,
+            lemma=lemma,
+            start=idx,
+            end=idx + len(text),
+            is_separable=is_separable,
+            separable_parts=separable_parts or None,  # None if empty
+            paired_with=paired_with or None,
+            is_reflexive=is_reflexive,
+            verb_prepositions=verb_prepositions,
+            linked_verb=linked_verb,
+            governs_case=governs_case
+        )
+
+    return cast(List[TokenData], tokens)
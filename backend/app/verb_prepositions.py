@@ -4,48 +4,95 @@ This module contains mappings of German verbs to their common prepositions
 and the grammatical case (Akkusativ, Dativ, Genitiv) that the preposition governs.
 """
 
-from typing import Dict, List, Optional
+from bisect import bisect_left
+from functools import lru_cache
+import numpy as np
+from spacy.attrs import LOWER, POS
+from spacy.strings import get_string_id
+from spacy.symbols import ADP, ADV, AUX, VERB
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+class PrepositionMatch(NamedTuple):
+    """A preposition found to belong to a verb."""
+    preposition: Any  # spaCy Token (could be "damit", "auf", etc.)
+    case: str  # e.g., "Akkusativ", "Dativ", "Akkusativ/Dativ"
+    position: int  # Character position in text
+
+
+# Pronominal adverbs (Pronominaladverbien) that contain prepositions
+# These are compounds like "damit" (da+mit), "darauf" (da+auf), etc.
+_PRONOMINAL_ADVERBS = {
+    'daran': 'an',
+    'darauf': 'auf',
+    'daraus': 'aus',
+    'darin': 'in',
+    'damit': 'mit',
+    'danach': 'nach',
+    'davon': 'von',
+    'davor': 'vor',
+    'dazu': 'zu',
+    'darüber': 'über',
+    'darunter': 'unter',
+    'dagegen': 'gegen',
+    'dafür': 'für',
+    'dabei': 'bei',
+    # Also wo- forms (used in questions)
+    'woran': 'an',
+    'worauf': 'auf',
+    'woraus': 'aus',
+    'worin': 'in',
+    'womit': 'mit',
+    'wonach': 'nach',
+    'wovon': 'von',
+    'wovor': 'vor',
+    'wozu': 'zu',
+    'worüber': 'über',
+    'worunter': 'unter',
+    'wogegen': 'gegen',
+    'wofür': 'für',
+    'wobei': 'bei',
+}
+
+# Dependency labels of a prepositional object that make the phrase a verb argument
+_ARGUMENT_DEPS = frozenset({'op', 'oa', 'obl', 'obj', 'mo'})
+
+# Dependency labels of a preposition attached directly to the verb as an argument
+_DIRECT_ARGUMENT_DEPS = frozenset({'op', 'obl', 'obj', 'oa'})
+
+# spaCy's morphological case abbreviations -> German case names
+_CASE_NAMES = {
+    'Nom': 'Nominativ',
+    'Acc': 'Akkusativ',
+    'Dat': 'Dativ',
+    'Gen': 'Genitiv',
+}
+
+# POS symbol ids of verbs (main and auxiliary)
+_VERB_POS = frozenset({VERB, AUX})
+
+# Maximum number of dependency-tree hops when linking a preposition to a verb
+_MAX_HEAD_HOPS = 3
+
+
+class _IdTables(NamedTuple):
+    """StringStore-id lookup tables used by VerbPrepositionDetector."""
+    verb_prep_ids: Dict[int, Dict[int, str]]  # verb lemma id -> {preposition id: case}
+    pronominal_ids: Dict[int, Tuple[str, int]]  # adverb id -> (preposition, preposition id)
+    pronominal_id_array: Any  # numpy uint64 array of the pronominal adverb ids
+    argument_dep_ids: frozenset
+    direct_argument_dep_ids: frozenset
+    case_dep_id: int
+
+
 class VerbPrepositionDetector:
     """Detects verb-preposition combinations and their grammatical cases."""
 
-    # Pronominal adverbs (Pronominaladverbien) that contain prepositions
-    # These are compounds like "damit" (da+mit), "darauf" (da+auf), etc.
-    PRONOMINAL_ADVERBS = {
-        'daran': 'an',
-        'darauf': 'auf',
-        'daraus': 'aus',
-        'darin': 'in',
-        'damit': 'mit',
-        'danach': 'nach',
-        'davon': 'von',
-        'davor': 'vor',
-        'dazu': 'zu',
-        'darüber': 'über',
-        'darunter': 'unter',
-        'dagegen': 'gegen',
-        'dafür': 'für',
-        'dabei': 'bei',
-        # Also wo- forms (used in questions)
-        'woran': 'an',
-        'worauf': 'auf',
-        'woraus': 'aus',
-        'worin': 'in',
-        'womit': 'mit',
-        'wonach': 'nach',
-        'wovon': 'von',
-        'wovor': 'vor',
-        'wozu': 'zu',
-        'worüber': 'über',
-        'worunter': 'unter',
-        'wogegen': 'gegen',
-        'wofür': 'für',
-        'wobei': 'bei',
-    }
+    # Class-level aliases of the module constants (hot loops use the module names)
+    PRONOMINAL_ADVERBS = _PRONOMINAL_ADVERBS
 
     # Comprehensive mapping of verb lemmas to their common prepositions and cases
     # Format: verb_lemma -> [(preposition, case)]
@@ -199,7 +246,122 @@ class VerbPrepositionDetector:
         'anstatt': 'Genitiv',
     }
 
-    def detect_verb_prepositions(self, doc, verb_token, verb_lemma=None) -> List[Dict]:
+    def __init__(self):
+        """Initialize the detector."""
+        # StringStore-id tables, built once per process and shared by every detector
+        tables = self._id_tables()
+        self._verb_prep_ids = tables.verb_prep_ids
+        self._pronominal_ids = tables.pronominal_ids
+        self._pronominal_id_array = tables.pronominal_id_array
+        self._argument_dep_ids = tables.argument_dep_ids
+        self._direct_argument_dep_ids = tables.direct_argument_dep_ids
+        self._case_dep_id = tables.case_dep_id
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def _id_tables(cls) -> "_IdTables":
+        """
+        Build the id-keyed verb/preposition tables.
+
+        Maps verb lemma id -> {preposition id: case}, so the per-candidate
+        check is a single integer dict lookup instead of a scan of string tuples,
+        and pronominal adverb id -> (preposition, preposition id), so adverbs are
+        matched on token.lower without decoding the token's string.
+
+        StringStore ids don't depend on the vocab (get_string_id returns the
+        symbol id for spaCy symbols such as "obj"/"obl" and the string hash
+        otherwise), so the tables are computed once per process.
+        """
+        pronominal_ids = {
+            get_string_id(adverb): (prep, get_string_id(prep))
+            for adverb, prep in _PRONOMINAL_ADVERBS.items()
+        }
+        return _IdTables(
+            verb_prep_ids={
+                get_string_id(lemma): {get_string_id(prep): case for prep, case in preps}
+                for lemma, preps in cls.VERB_PREPOSITION_MAP.items()
+            },
+            pronominal_ids=pronominal_ids,
+            pronominal_id_array=np.fromiter(pronominal_ids, dtype=np.uint64),
+            argument_dep_ids=frozenset(get_string_id(dep) for dep in _ARGUMENT_DEPS),
+            direct_argument_dep_ids=frozenset(get_string_id(dep) for dep in _DIRECT_ARGUMENT_DEPS),
+            case_dep_id=get_string_id('case'),
+        )
+
+    def index_prepositions(self, doc) -> Dict[int, List[tuple]]:
+        """
+        Index preposition candidates of a Doc by sentence.
+
+        Candidate positions are found in one vectorized pass over the POS and
+        lowercase ids, so only ADPs and pronominal adverbs are visited in Python,
+        and every verb in a sentence reuses the same candidate list.
+
+        Args:
+            doc: spaCy Doc object
+
+        Returns:
+            Dictionary mapping sentence start index to (token, preposition, preposition_id) tuples
+        """
+        attrs = doc.to_array([POS, LOWER])
+        pos_ids = attrs[:, 0]
+        is_candidate = (pos_ids == ADP) | (
+            (pos_ids == ADV) & np.isin(attrs[:, 1], self._pronominal_id_array)
+        )
+        positions = np.flatnonzero(is_candidate).tolist()
+
+        index = {}
+        for sent in doc.sents:
+            # positions is sorted, so each sentence's candidates are a contiguous slice
+            lo = bisect_left(positions, sent.start)
+            hi = bisect_left(positions, sent.end, lo)
+            index[sent.start] = [self._candidate(doc[i]) for i in positions[lo:hi]]
+        return index
+
+    def _sentence_prepositions(self, sentence) -> List[tuple]:
+        """
+        Find the preposition candidates in a sentence.
+
+        Args:
+            sentence: spaCy Span for the sentence
+
+        Returns:
+            List of (token, preposition, preposition_id) tuples, where preposition
+            is the lowercase preposition text (extracted for pronominal adverbs)
+            and preposition_id its StringStore id
+        """
+        candidates = []
+        for token in sentence:
+            candidate = self._candidate(token)
+            if candidate is not None:
+                candidates.append(candidate)
+
+        return candidates
+
+    def _candidate(self, token) -> Optional[tuple]:
+        """
+        Build the (token, preposition, preposition_id) candidate for a token.
+
+        Returns:
+            The candidate tuple, or None if the token is neither an ADP
+            nor a pronominal adverb
+        """
+        pos = token.pos
+        # Check if this is a preposition (ADP = adposition)
+        if pos == ADP:
+            return (token, token.lower_, token.lower)
+
+        # Check if this is a pronominal adverb (damit, darauf, etc.)
+        if pos == ADV:
+            pronominal = self._pronominal_ids.get(token.lower)
+            if pronominal is not None:
+                # Extract the preposition from the pronominal adverb
+                prep_text, prep_id = pronominal
+                logger.debug("Found pronominal adverb: %s -> %s", token.text, prep_text)
+                return (token, prep_text, prep_id)
+
+        return None
+
+    def detect_verb_prepositions(self, doc, verb_token, verb_lemma=None, prep_index=None) -> List[PrepositionMatch]:
         """
         Detect prepositions associated with a verb using dependency parsing.
 
@@ -211,10 +373,10 @@ class VerbPrepositionDetector:
             doc: spaCy Doc object
             verb_token: The verb token to analyze
             verb_lemma: Optional override for the verb's lemma (useful for separable verbs)
+            prep_index: Optional result of index_prepositions(doc), to avoid rescanning the sentence
 
         Returns:
-            List of dictionaries with preposition information:
-            [{'preposition': token, 'case': 'Akkusativ/Dativ', 'position': int}, ...]
+            List of PrepositionMatch(preposition, case, position) tuples
         """
         results = []
 
@@ -222,60 +384,48 @@ class VerbPrepositionDetector:
         # Use provided lemma if available (important for separable verbs like "beitragen")
         if verb_lemma is None:
             verb_lemma = verb_token.lemma_
-
-        # Check if this is a reflexive verb (lemma starts with "sich")
-        if verb_lemma.startswith('sich '):
-            # Use the full reflexive lemma for lookup
-            lookup_lemma = verb_lemma
+            lemma_id = verb_token.lemma  # already interned, no hashing needed
         else:
-            lookup_lemma = verb_lemma
+            lemma_id = doc.vocab.strings[verb_lemma]
 
         # Get expected prepositions for this verb (optional, for specific case info)
         # This is now optional - we primarily use dependency parsing
-        expected_preps = self.VERB_PREPOSITION_MAP.get(lookup_lemma, [])
+        # (reflexive verbs are looked up by their full "sich ..." lemma)
+        expected_prep_ids = self._verb_prep_ids.get(lemma_id)
 
         # Look for prepositions near the verb (within the same clause)
         sentence = verb_token.sent
+        if prep_index is not None:
+            candidates = prep_index.get(sentence.start, [])
+        else:
+            candidates = self._sentence_prepositions(sentence)
 
-        for token in sentence:
-            prep_text = None
+        # prep_text is the preposition (either direct or from pronominal adverb)
+        for token, prep_text, prep_id in candidates:
             actual_token = token  # The token to highlight
 
-            # Check if this is a preposition (ADP = adposition)
-            if token.pos_ == 'ADP':
-                prep_text = token.text.lower()
-
-            # Check if this is a pronominal adverb (damit, darauf, etc.)
-            elif token.pos_ == 'ADV' and token.text.lower() in self.PRONOMINAL_ADVERBS:
-                # Extract the preposition from the pronominal adverb
-                prep_text = self.PRONOMINAL_ADVERBS[token.text.lower()]
-                logger.debug(f"Found pronominal adverb: {token.text} -> {prep_text}")
-
-            # If we found a preposition (either direct or from pronominal adverb)
-            if prep_text:
-                # If we have dictionary data for this verb, use it to filter
-                # This ensures we only report prepositions that are known to go with this verb
-                if expected_preps:
-                    # Check if this preposition is in the verb's expected list
-                    if not any(prep == prep_text for prep, _ in expected_preps):
-                        # This preposition is not expected for this verb
-                        # Skip it (it's likely an adjunct, not a verb argument)
-                        continue
-
-                # Check if this preposition is syntactically connected to the verb
-                if self._is_prep_connected_to_verb(token, verb_token, doc):
-                    # Determine the case (pass token for morphological analysis)
-                    case = self._determine_case(prep_text, expected_preps, token)
-
-                    results.append({
-                        'preposition': actual_token,  # The actual token (could be "damit", "auf", etc.)
-                        'case': case,
-                        'position': actual_token.idx
-                    })
-
-                    logger.debug(
-                        f"Found verb-preposition: {verb_lemma} + {prep_text} ({case})"
-                    )
+            # If we have dictionary data for this verb, use it to filter
+            # This ensures we only report prepositions that are known to go with this verb
+            # One lookup gives both the filter result and the dictionary case
+            expected_case = None
+            if expected_prep_ids is not None:
+                expected_case = expected_prep_ids.get(prep_id)
+                if expected_case is None:
+                    # This preposition is not expected for this verb
+                    # Skip it (it's likely an adjunct, not a verb argument)
+                    continue
+
+            # Check if this preposition is syntactically connected to the verb
+            if self._is_prep_connected_to_verb(token, verb_token, doc):
+                # Determine the case (pass token for morphological analysis)
+                case = self._determine_case(prep_text, expected_case, token)
+
+                # The actual token is highlighted (could be "damit", "auf", etc.)
+                results.append(PrepositionMatch(actual_token, case, actual_token.idx))
+
+                logger.debug(
+                    "Found verb-preposition: %s + %s (%s)", verb_lemma, prep_text, case
+                )
 
         return results
 
@@ -289,71 +439,74 @@ class VerbPrepositionDetector:
         Only returns True for prepositions that are true verb complements,
         not optional adjuncts.
         """
-        # Check if preposition is in the same sentence
-        if prep_token.sent != verb_token.sent:
+        verb_i = verb_token.i
+        prep_i = prep_token.i
+
+        # Check if preposition is in the same sentence (Span objects are rebuilt
+        # on every .sent access, so compare their start indices)
+        if prep_token.sent.start != verb_token.sent.start:
             return False
 
         # Strategy 1: Check if the prepositional phrase is a direct argument
         # Look at the object of the preposition and check its relationship to the verb
+        # (children of the preposition always have it as their head)
         for child in prep_token.children:
-            if child.head == prep_token:  # child depends on the preposition
-                # Check if this child (the prepositional object) has a dependency to the verb
-                # Common dependencies for verb complements:
-                # - "mo" (modifier, but can be argument)
-                # - "op" (prepositional object)
-                # - "obl" (oblique argument)
-                # - "oa" (accusative object)
-
-                # Walk up the dependency tree to find connection to verb
-                current = child
-                for _ in range(3):  # Max 3 hops up the tree
-                    if current.head == verb_token:
-                        # The prepositional phrase connects to our verb
-                        # Now check if it's an argument (not just adjunct)
-                        # Arguments typically have dependencies: obj, obl, op, oa
-                        # Adjuncts have: mo (modifier), advmod, etc.
-
-                        # For German, "mo" can be either argument or adjunct
-                        # We need to check if this preposition is common with this verb
-                        if current.dep_ in ['op', 'oa', 'obl', 'obj', 'mo']:
-                            # Additional check: preposition should be marked as "case"
-                            # or be an ADP governing the object
-                            if prep_token.dep_ == 'case' or prep_token.pos_ == 'ADP':
-                                return True
-                        return False
-                    current = current.head
-                    if current == current.head:  # Root of tree
-                        break
+            # Check if this child (the prepositional object) has a dependency to the verb
+            # Common dependencies for verb complements:
+            # - "mo" (modifier, but can be argument)
+            # - "op" (prepositional object)
+            # - "obl" (oblique argument)
+            # - "oa" (accusative object)
+
+            # Walk up the dependency tree to find connection to verb
+            current = child
+            for _ in range(_MAX_HEAD_HOPS):
+                head = current.head
+                head_i = head.i
+                if head_i == verb_i:
+                    # The prepositional phrase connects to our verb
+                    # Now check if it's an argument (not just adjunct)
+                    # Arguments typically have dependencies: obj, obl, op, oa
+                    # Adjuncts have: mo (modifier), advmod, etc.
+
+                    # For German, "mo" can be either argument or adjunct
+                    # We need to check if this preposition is common with this verb
+                    # Additional check: preposition should be marked as "case"
+                    # or be an ADP governing the object
+                    return (current.dep in self._argument_dep_ids
+                            and (prep_token.pos == ADP or prep_token.dep == self._case_dep_id))
+                if head_i == current.i:  # Root of tree
+                    break
+                current = head
 
         # Strategy 2: Check if preposition itself has direct dependency to verb
         # Some parsers connect prepositions directly
-        if prep_token.head == verb_token:
-            # Verify it's not just a loose adjunct
-            # True arguments usually don't have dep "mo" when directly attached
-            if prep_token.dep_ in ['op', 'obl', 'obj', 'oa']:
-                return True
+        # Verify it's not just a loose adjunct
+        # True arguments usually don't have dep "mo" when directly attached
+        if prep_token.head.i == verb_i and prep_token.dep in self._direct_argument_dep_ids:
+            return True
 
         # Strategy 3: For pronominal adverbs (damit, darauf), check proximity
         # These are often parsed differently
-        if prep_token.text.lower() in self.PRONOMINAL_ADVERBS:
+        if prep_token.lower in self._pronominal_ids:
             # Check if it's within reasonable distance and no intervening verbs
-            distance = abs(prep_token.i - verb_token.i)
+            distance = abs(prep_i - verb_i)
             if distance <= 4:  # Tighter constraint for pronominal adverbs
-                tokens_between = doc[min(prep_token.i, verb_token.i):max(prep_token.i, verb_token.i)]
-                other_verbs = [t for t in tokens_between if t.pos_ in ['VERB', 'AUX'] and t != verb_token]
-                if not other_verbs:
+                tokens_between = doc[min(prep_i, verb_i):max(prep_i, verb_i)]
+                if not any(t.pos in _VERB_POS and t.i != verb_i for t in tokens_between):
                     # Check if it's directly connected to verb in dependency tree
-                    current = prep_token
-                    for _ in range(3):
-                        if current.head == verb_token:
+                    current_i = prep_i
+                    for _ in range(_MAX_HEAD_HOPS):
+                        head_i = doc[current_i].head.i
+                        if head_i == verb_i:
                             return True
-                        current = current.head
-                        if current == current.head:
+                        if head_i == current_i:  # Root of tree
                             break
+                        current_i = head_i
 
         return False
 
-    def _determine_case(self, preposition: str, expected_preps: List[tuple], prep_token=None) -> str:
+    def _determine_case(self, preposition: str, expected_case: Optional[str] = None, prep_token=None) -> str:
         """
         Determine the grammatical case for a preposition in context.
 
@@ -364,7 +517,7 @@ class VerbPrepositionDetector:
 
         Args:
             preposition: The preposition text
-            expected_preps: List of expected (prep, case) tuples for this verb
+            expected_case: Case listed for this verb/preposition pair in VERB_PREPOSITION_MAP, if any
             prep_token: The actual preposition token (for analyzing its object)
 
         Returns:
@@ -377,9 +530,8 @@ class VerbPrepositionDetector:
                 return detected_case
 
         # Strategy 2: Check verb-specific dictionary (optional)
-        for prep, case in expected_preps:
-            if prep == preposition:
-                return case
+        if expected_case is not None:
+            return expected_case
 
         # Strategy 3: Use general preposition case rules
         return self.PREPOSITION_CASES.get(preposition, 'Unknown')
@@ -399,18 +551,10 @@ class VerbPrepositionDetector:
         """
         # Look for the object of the preposition (usually has dep="pobj" or "nk")
         for child in prep_token.children:
-            # Check morphological features for case information
-            if child.morph.get('Case'):
-                case_values = child.morph.get('Case')
-                if case_values:
-                    # spaCy uses standard abbreviations: Nom, Acc, Dat, Gen
-                    case_map = {
-                        'Nom': 'Nominativ',
-                        'Acc': 'Akkusativ',
-                        'Dat': 'Dativ',
-                        'Gen': 'Genitiv'
-                    }
-                    case_abbrev = case_values[0] if isinstance(case_values, list) else case_values
-                    return case_map.get(case_abbrev, None)
+            # Check morphological features for case information (one lookup per child)
+            case_values = child.morph.get('Case')
+            if case_values:
+                # The first child carrying a case decides
+                return _CASE_NAMES.get(case_values[0])
 
         return None
@@ -1,17 +1,27 @@
 """Configuration module for DeutschSpectrum backend."""
+from functools import lru_cache
 from pathlib import Path
 import yaml
 import os
 from typing import Dict, Any, List, Optional
 
+# libyaml-backed loader when PyYAML was built with it, pure-Python otherwise
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 # Get config directory
 CONFIG_DIR = Path(__file__).parent
 
 
+@lru_cache(maxsize=4)
 def load_config(config_file: str = "config.yaml") -> Dict[str, Any]:
     """
     Load configuration from YAML file.
 
+    The parsed file is cached per process; treat the result as read-only.
+
     Args:
         config_file: Name of the config file (default: config.yaml)
 
@@ -24,7 +34,7 @@ def load_config(config_file: str = "config.yaml") -> Dict[str, Any]:
         raise FileNotFoundError(f"Configuration file not found: {config_path}")
 
     with open(config_path, 'r') as f:
-        config = yaml.safe_load(f)
+        config = yaml.load(f, Loader=SafeLoader)
 
     return config
 
@@ -46,8 +56,8 @@ def get_environment_config(environment: Optional[str] = None) -> Dict[str, Any]:
     if environment is None:
         environment = os.getenv('ENVIRONMENT', config.get('default_environment', 'production'))
 
-    # Get environment-specific config
-    env_config = config['environments'].get(environment, {})
+    # Get environment-specific config (copied, load_config's result is shared)
+    env_config = dict(config['environments'].get(environment, {}))
 
     # Merge with global config
     global_config = config.get('global', {})
@@ -69,10 +79,15 @@ class Config:
     def __init__(self, environment: Optional[str] = None):
         """Initialize configuration."""
         self.config = get_environment_config(environment)
+        # Settings become plain instance attributes, so reads skip __getattr__
+        self.__dict__.update(self.config)
 
     def __getattr__(self, name: str) -> Any:
-        """Get configuration value by attribute name."""
-        return self.config.get(name)
+        """Return None for settings missing from the configuration."""
+        # Only reached when normal lookup fails; dunders must still raise for pickle/copy
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return None
 
     def get(self, key: str, default: Any = None) -> Any:
         """Get configuration value with default fallback."""
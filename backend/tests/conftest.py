@@ -0,0 +1,70 @@
+"""Shared fixtures: hand-built, parsed spaCy Docs (no model needed)."""
+import pytest
+import spacy
+from spacy.tokens import Doc
+
+# Blank German pipeline: provides lexical attributes (token.lower) without a model
+VOCAB = spacy.blank("de").vocab
+
+
+@pytest.fixture
+def vocab():
+    """The shared vocab of every Doc built by make_doc."""
+    return VOCAB
+
+
+@pytest.fixture
+def make_doc():
+    """Return a builder for parsed Docs; heads are absolute token indices."""
+    def build(words, pos, deps, heads, lemmas=None, morphs=None):
+        return Doc(
+            VOCAB,
+            words=words,
+            pos=pos,
+            deps=deps,
+            heads=heads,
+            lemmas=lemmas or [word.lower() for word in words],
+            morphs=morphs,
+        )
+    return build
+
+
+class StubAnalyzer:
+    """Stand-in for POSAnalyzer: one token per space-separated word, calls recorded."""
+
+    def __init__(self):
+        self.batches = []
+
+    def analyze_text(self, text):
+        return self.analyze_texts([text])[0]
+
+    def analyze_texts(self, texts, batch_size=32):
+        from app.models import TokenData
+
+        self.batches.append(list(texts))
+        results = []
+        for text in texts:
+            tokens, start = [], 0
+            for word in text.split(" "):
+                if word:
+                    tokens.append(TokenData(text=word, pos="X", lemma=word, start=start, end=start + len(word)))
+                start += len(word) + 1
+            results.append(tokens)
+        return results
+
+
+@pytest.fixture
+def api(monkeypatch):
+    """TestClient for the app with the spaCy model replaced by StubAnalyzer."""
+    from fastapi.testclient import TestClient
+
+    import app.main as main
+    from app.cache import analysis_cache
+
+    stub = StubAnalyzer()
+    monkeypatch.setattr(main, "POSAnalyzer", lambda: stub)
+    analysis_cache.clear()
+    with TestClient(main.app) as client:
+        client.analyzer = stub
+        yield client
+    analysis_cache.clear()
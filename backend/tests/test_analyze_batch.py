@@ -0,0 +1,99 @@
+"""Tests for the /analyze_batch endpoint with a stub analyzer."""
+import pytest
+
+from app.main import MAX_BATCH_TEXTS
+
+URL = "/api/v1/analyze_batch"
+
+
+def token_texts(result):
+    return [token["text"] for token in result["tokens"]]
+
+
+@pytest.mark.parametrize("payload", [
+    {},
+    {"texts": "Ich stehe auf"},
+    {"texts": None},
+    {"texts": ["Ich", 1]},
+    {"texts": ["Ich", None]},
+    ["Ich"],
+], ids=["missing", "string", "null", "int-item", "null-item", "not-an-object"])
+def test_invalid_texts_are_rejected(api, payload):
+    response = api.post(URL, json=payload)
+
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize("positions", [
+    [0],
+    [0, 1, 2],
+    [True, None],
+    [0, False],
+    [0, "1"],
+    [0, 1.5],
+    {"0": 1},
+], ids=["too-short", "too-long", "bool", "bool-false", "string", "float", "not-a-list"])
+def test_invalid_target_positions_are_rejected(api, positions):
+    response = api.post(URL, json={"texts": ["Ich", "Du"], "target_positions": positions})
+
+    assert response.status_code == 422
+
+
+def test_invalid_json_is_rejected(api):
+    response = api.post(URL, content=b'{"texts": [', headers={"Content-Type": "application/json"})
+
+    assert response.status_code == 400
+
+
+def test_empty_text_is_rejected(api):
+    response = api.post(URL, json={"texts": ["Ich", "  "]})
+
+    assert response.status_code == 400
+
+
+def test_batch_size_limit(api):
+    texts = [f"Wort {i}" for i in range(MAX_BATCH_TEXTS + 1)]
+
+    assert api.post(URL, json={"texts": texts[:MAX_BATCH_TEXTS]}).status_code == 200
+    assert api.post(URL, json={"texts": texts}).status_code == 413
+
+
+def test_results_follow_request_order(api):
+    texts = ["Ich stehe auf", "Du gehst", "Er kommt heute mit"]
+
+    response = api.post(URL, json={"texts": texts})
+
+    assert response.status_code == 200
+    assert [token_texts(result) for result in response.json()["results"]] == [text.split() for text in texts]
+
+
+def test_duplicate_texts_are_analyzed_once(api):
+    texts = ["Du gehst", "Ich stehe auf", "Du gehst", "Ich stehe auf", "Du gehst"]
+
+    response = api.post(URL, json={"texts": texts, "target_positions": [0, 4, 3, None, 100]})
+
+    analyzed = [text for batch in api.analyzer.batches for text in batch]
+    assert sorted(analyzed) == ["Du gehst", "Ich stehe auf"]
+
+    # Every duplicate still gets its own slot and its own target
+    results = response.json()["results"]
+    assert [token_texts(result) for result in results] == [text.split() for text in texts]
+    assert [result.get("target_index") for result in results] == [0, 1, 1, None, None]
+
+
+def test_cached_texts_are_not_reanalyzed(api):
+    api.post(URL, json={"texts": ["Ich stehe auf"]})
+
+    response = api.post(URL, json={"texts": ["Du gehst", "Ich stehe auf"]})
+
+    assert response.status_code == 200
+    assert api.analyzer.batches == [["Ich stehe auf"], ["Du gehst"]]
+    assert [token_texts(result) for result in response.json()["results"]] == [["Du", "gehst"], ["Ich", "stehe", "auf"]]
+
+
+def test_target_positions_without_match_omit_target_fields(api):
+    response = api.post(URL, json={"texts": ["Ich stehe"], "target_positions": [3]})
+
+    (result,) = response.json()["results"]
+    assert "target_index" not in result
+    assert "paired_indices" not in result
@@ -0,0 +1,130 @@
+"""Tests for AnalysisBatcher request coalescing with a fake analyzer."""
+import asyncio
+import threading
+
+import pytest
+
+from app.batcher import AnalysisBatcher
+
+
+class FakeAnalyzer:
+    """Records each batched call and returns the texts upper-cased."""
+
+    def __init__(self, fail_batch=False, fail_texts=(), gate=None):
+        self.batches = []
+        self.singles = []
+        self.fail_batch = fail_batch
+        self.fail_texts = set(fail_texts)
+        self.gate = gate  # threading.Event the batched call waits on, if set
+
+    def analyze_texts(self, texts, batch_size=32):
+        self.batches.append(list(texts))
+        if self.gate is not None:
+            self.gate.wait(5)
+        if self.fail_batch:
+            raise RuntimeError("batch failed")
+        return [text.upper() for text in texts]
+
+    def analyze_text(self, text):
+        self.singles.append(text)
+        if text in self.fail_texts:
+            raise ValueError(text)
+        return text.upper()
+
+
+def run_batcher(analyzer, scenario, **kwargs):
+    """Run scenario(batcher) on a started batcher and stop it afterwards."""
+    async def main():
+        batcher = AnalysisBatcher(analyzer, **kwargs)
+        batcher.start()
+        try:
+            return await scenario(batcher)
+        finally:
+            await batcher.stop()
+    return asyncio.run(main())
+
+
+def gather_texts(texts):
+    async def scenario(batcher):
+        return await asyncio.gather(*(batcher.analyze(text) for text in texts), return_exceptions=True)
+    return scenario
+
+
+def test_concurrent_requests_share_one_batch():
+    analyzer = FakeAnalyzer()
+    texts = ["eins", "zwei", "drei", "vier"]
+
+    results = run_batcher(analyzer, gather_texts(texts), window=0.05)
+
+    assert results == ["EINS", "ZWEI", "DREI", "VIER"]
+    assert analyzer.batches == [texts]
+
+
+def test_requests_outside_the_window_get_separate_batches():
+    analyzer = FakeAnalyzer()
+
+    async def scenario(batcher):
+        first = await batcher.analyze("eins")
+        await asyncio.sleep(0.02)
+        return [first, await batcher.analyze("zwei")]
+
+    assert run_batcher(analyzer, scenario, window=0.005) == ["EINS", "ZWEI"]
+    assert analyzer.batches == [["eins"], ["zwei"]]
+
+
+def test_batches_are_capped_at_max_batch_size():
+    analyzer = FakeAnalyzer()
+    texts = [f"text {i}" for i in range(7)]
+
+    results = run_batcher(analyzer, gather_texts(texts), window=0.05, max_batch_size=3)
+
+    assert results == [text.upper() for text in texts]
+    assert [len(batch) for batch in analyzer.batches] == [3, 3, 1]
+    assert [text for batch in analyzer.batches for text in batch] == texts
+
+
+def test_failed_batch_falls_back_to_single_texts():
+    analyzer = FakeAnalyzer(fail_batch=True, fail_texts={"kaputt"})
+
+    results = run_batcher(analyzer, gather_texts(["eins", "kaputt", "drei"]), window=0.05)
+
+    # Only the text that fails on its own gets an error
+    assert results[0] == "EINS"
+    assert isinstance(results[1], ValueError)
+    assert results[2] == "DREI"
+    assert analyzer.singles == ["eins", "kaputt", "drei"]
+
+
+def test_stop_fails_requests_still_collecting():
+    analyzer = FakeAnalyzer()
+
+    async def main():
+        # A long window keeps the requests in the batch being collected
+        batcher = AnalysisBatcher(analyzer, window=10)
+        batcher.start()
+        pending = [asyncio.ensure_future(batcher.analyze(text)) for text in ("eins", "zwei")]
+        await asyncio.sleep(0.01)
+        await batcher.stop()
+        return await asyncio.wait_for(asyncio.gather(*pending, return_exceptions=True), 1)
+
+    results = asyncio.run(main())
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert analyzer.batches == []
+
+
+def test_stop_waits_for_batches_in_progress():
+    gate = threading.Event()
+    analyzer = FakeAnalyzer(gate=gate)
+
+    async def main():
+        batcher = AnalysisBatcher(analyzer, window=0.001)
+        batcher.start()
+        pending = asyncio.ensure_future(batcher.analyze("eins"))
+        while not analyzer.batches:
+            await asyncio.sleep(0.001)
+        asyncio.get_running_loop().call_later(0.02, gate.set)
+        await batcher.stop()
+        return await asyncio.wait_for(pending, 1)
+
+    assert asyncio.run(main()) == "EINS"
@@ -0,0 +1,99 @@
+"""Tests for POSAnalyzer bulk processing with a toy pipeline (no model needed)."""
+import pytest
+import spacy
+from spacy.language import Language
+
+import app.pos_analyzer as pos_analyzer
+from app.pos_analyzer import (
+    PIPE_BATCH_SIZE_DEFAULT,
+    PIPE_BATCH_SIZE_MAX,
+    PIPE_BATCH_SIZE_MIN,
+    POSAnalyzer,
+)
+
+_TOY_VERBS = {"stehe": "stehen", "rufe": "rufen", "komme": "kommen"}
+_TOY_PARTICLES = {"auf", "an", "mit"}
+
+
+@Language.component("toy_parser")
+def toy_parser(doc):
+    """Parse one-clause texts: the known verb is the root, known particles are its svp."""
+    verbs = [token for token in doc if token.lower_ in _TOY_VERBS]
+    root = verbs[0] if verbs else doc[0]
+    for token in doc:
+        if token.lower_ in _TOY_VERBS:
+            token.pos_, token.lemma_ = "VERB", _TOY_VERBS[token.lower_]
+        elif token.lower_ in _TOY_PARTICLES:
+            token.pos_, token.lemma_ = "ADP", token.lower_
+        else:
+            token.pos_, token.lemma_ = "X", token.lower_
+        if token is not root:
+            token.head = root
+            token.dep_ = "svp" if token.lower_ in _TOY_PARTICLES else "dep"
+        else:
+            token.dep_ = "ROOT"
+    return doc
+
+
+@pytest.fixture
+def analyzer(monkeypatch):
+    def load(name, disable=()):
+        nlp = spacy.blank("de")
+        nlp.add_pipe("toy_parser")
+        return nlp
+
+    monkeypatch.setattr(pos_analyzer.spacy, "load", load)
+    return POSAnalyzer()
+
+
+@pytest.mark.parametrize("count, n_process, cpus, expected", [
+    (0, 1, 4, PIPE_BATCH_SIZE_MIN),  # empty input still gets a valid size
+    (10, 1, 4, PIPE_BATCH_SIZE_MIN),  # small inputs are clamped up
+    (60, 1, 4, 60),  # in range: everything in one batch
+    (1000, 1, 4, PIPE_BATCH_SIZE_MAX),  # large inputs are clamped down
+    (400, 8, 4, 50),  # split across the requested workers
+    (401, 8, 4, 51),  # rounded up so no worker gets an extra batch
+    (240, -1, 4, 60),  # -1 uses every core
+    (240, -1, None, PIPE_BATCH_SIZE_MAX),  # unknown core count counts as one
+])
+def test_auto_batch_size_clamps(monkeypatch, count, n_process, cpus, expected):
+    monkeypatch.setattr(pos_analyzer.os, "cpu_count", lambda: cpus)
+
+    assert POSAnalyzer._auto_batch_size(["Text"] * count, n_process) == expected
+
+
+def test_auto_batch_size_for_unsized_input():
+    texts = (text for text in ["Ich stehe auf"] * 1000)
+
+    assert POSAnalyzer._auto_batch_size(texts, 1) == PIPE_BATCH_SIZE_DEFAULT
+
+
+@pytest.mark.parametrize("batch_size", [None, 1, 2])
+def test_process_texts_yields_in_input_order(analyzer, batch_size):
+    texts = ["Ich stehe früh auf", "Wir rufen", "Ich rufe dich an", "Er komme mit", "Hallo"]
+
+    results = list(analyzer.process_texts(texts, n_process=1, batch_size=batch_size))
+
+    assert [doc.text for doc, *_ in results] == texts
+    assert [[pair.lemma for pair in separable] for _, separable, _, _ in results] == [
+        ["aufstehen"], [], ["anrufen"], ["mitkommen"], []
+    ]
+
+
+def test_process_texts_accepts_generators(analyzer):
+    texts = ["Ich stehe auf", "Ich rufe an"]
+
+    results = list(analyzer.process_texts(iter(texts), n_process=1))
+
+    assert [doc.text for doc, *_ in results] == texts
+
+
+def test_process_texts_keeps_order_across_workers(analyzer):
+    texts = [f"Ich stehe {i} auf" if i % 2 else f"Ich rufe {i} an" for i in range(40)]
+
+    results = list(analyzer.process_texts(texts, n_process=2, batch_size=3))
+
+    assert [doc.text for doc, *_ in results] == texts
+    assert [pair.lemma for _, separable, _, _ in results for pair in separable] == [
+        "aufstehen" if i % 2 else "anrufen" for i in range(40)
+    ]
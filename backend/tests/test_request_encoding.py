@@ -0,0 +1,64 @@
+"""Tests for gzip-encoded /analyze_batch request bodies."""
+import gzip
+
+import orjson
+import pytest
+
+from app.main import MAX_DECOMPRESSED_BODY_BYTES
+
+URL = "/api/v1/analyze_batch"
+
+
+def post_gzip(api, body, encoding="gzip"):
+    return api.post(URL, content=body, headers={"Content-Encoding": encoding, "Content-Type": "application/json"})
+
+
+def padded_body(size):
+    """A valid request body of exactly `size` bytes (JSON whitespace as padding)."""
+    head, tail = b'{"texts":["Ich stehe auf"]', b"}"
+    return head + b" " * (size - len(head) - len(tail)) + tail
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "GZIP", " gzip "])
+def test_gzip_body_is_decoded(api, encoding):
+    body = gzip.compress(orjson.dumps({"texts": ["Ich stehe auf"]}))
+
+    response = post_gzip(api, body, encoding)
+
+    assert response.status_code == 200
+    assert [token["text"] for token in response.json()["results"][0]["tokens"]] == ["Ich", "stehe", "auf"]
+
+
+@pytest.mark.parametrize("encoding", ["br", "deflate", "gzip, br"])
+def test_unsupported_encoding_is_rejected(api, encoding):
+    response = post_gzip(api, orjson.dumps({"texts": ["Ich"]}), encoding)
+
+    assert response.status_code == 415
+
+
+def test_body_at_decompressed_limit_is_accepted(api):
+    response = post_gzip(api, gzip.compress(padded_body(MAX_DECOMPRESSED_BODY_BYTES)))
+
+    assert response.status_code == 200
+
+
+def test_body_over_decompressed_limit_is_rejected(api):
+    response = post_gzip(api, gzip.compress(padded_body(MAX_DECOMPRESSED_BODY_BYTES + 1)))
+
+    assert response.status_code == 413
+    assert api.analyzer.batches == []
+
+
+def test_invalid_gzip_is_rejected(api):
+    response = post_gzip(api, orjson.dumps({"texts": ["Ich"]}))
+
+    assert response.status_code == 400
+
+
+def test_truncated_gzip_is_rejected(api):
+    body = gzip.compress(orjson.dumps({"texts": ["Ich stehe auf"]}))
+
+    response = post_gzip(api, body[:-8])
+
+    assert response.status_code == 400
+    assert api.analyzer.batches == []
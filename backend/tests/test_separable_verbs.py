@@ -0,0 +1,141 @@
+"""Tests for SeparableVerbDetector on hand-built spaCy Docs (no model needed)."""
+from concurrent.futures import ThreadPoolExecutor
+import sys
+import threading
+
+import numpy as np
+import pytest
+
+from app.separable_verbs import ReflexivePair, SeparablePair, SeparableVerbDetector
+
+
+@pytest.fixture
+def detector(vocab):
+    return SeparableVerbDetector(vocab)
+
+
+def test_svp_particle_pairs_only_with_its_head(make_doc, detector):
+    # "an" is an svp particle tagged ADP; "lacht" is closer, but the parse links it to "ruft"
+    doc = make_doc(
+        words=["Er", "ruft", "sie", "heute", "an", "und", "lacht", "."],
+        pos=["PRON", "VERB", "PRON", "ADV", "ADP", "CCONJ", "VERB", "PUNCT"],
+        deps=["sb", "ROOT", "oa", "mo", "svp", "cd", "cj", "punct"],
+        heads=[1, 1, 1, 1, 1, 1, 5, 1],
+        lemmas=["er", "rufen", "sie", "heute", "an", "und", "lachen", "."],
+    )
+
+    pairs = detector.detect_separable_verbs(doc)
+
+    assert pairs == [SeparablePair(doc[1], doc[4], "anrufen")]
+
+
+def test_svp_particle(make_doc, detector):
+    doc = make_doc(
+        words=["Ich", "stehe", "früh", "auf", "."],
+        pos=["PRON", "VERB", "ADV", "ADP", "PUNCT"],
+        deps=["sb", "ROOT", "mo", "svp", "punct"],
+        heads=[1, 1, 1, 1, 1],
+        lemmas=["ich", "stehen", "früh", "auf", "."],
+    )
+
+    assert detector.detect_separable_verbs(doc) == [SeparablePair(doc[1], doc[3], "aufstehen")]
+
+
+def test_mislabeled_particle_pairs_with_closest_verb(make_doc, detector):
+    # "mit" is parsed as a modifier, not svp, so the ADP/ADV fallback links it
+    doc = make_doc(
+        words=["Er", "kommt", "heute", "mit", "."],
+        pos=["PRON", "VERB", "ADV", "ADP", "PUNCT"],
+        deps=["sb", "ROOT", "mo", "mo", "punct"],
+        heads=[1, 1, 1, 1, 1],
+        lemmas=["er", "kommen", "heute", "mit", "."],
+    )
+
+    assert detector.detect_separable_verbs(doc) == [SeparablePair(doc[1], doc[3], "mitkommen")]
+
+
+def test_preposition_before_noun_phrase_is_not_a_particle(make_doc, detector):
+    doc = make_doc(
+        words=["Er", "kommt", "mit", "dem", "Bus", "."],
+        pos=["PRON", "VERB", "ADP", "DET", "NOUN", "PUNCT"],
+        deps=["sb", "ROOT", "mo", "nk", "nk", "punct"],
+        heads=[1, 1, 1, 4, 2, 1],
+        lemmas=["er", "kommen", "mit", "der", "Bus", "."],
+    )
+
+    assert detector.detect_separable_verbs(doc) == []
+
+
+@pytest.mark.parametrize("exclude", [
+    {3},
+    [3],
+    np.array([3]),
+    np.array([2, 3]),  # multi-element index arrays have no truth value
+    np.array([False, False, False, True, False]),
+], ids=["set", "list", "index-array", "index-array-2", "bool-mask"])
+def test_excluded_positions_are_skipped(make_doc, detector, exclude):
+    doc = make_doc(
+        words=["Er", "kommt", "heute", "mit", "."],
+        pos=["PRON", "VERB", "ADV", "ADP", "PUNCT"],
+        deps=["sb", "ROOT", "mo", "mo", "punct"],
+        heads=[1, 1, 1, 1, 1],
+        lemmas=["er", "kommen", "heute", "mit", "."],
+    )
+
+    assert detector.detect_separable_verbs(doc, exclude_positions=exclude) == []
+
+
+def test_reflexive_pronoun_attached_to_verb(make_doc, detector):
+    doc = make_doc(
+        words=["Ich", "freue", "mich", "."],
+        pos=["PRON", "VERB", "PRON", "PUNCT"],
+        deps=["sb", "ROOT", "oa", "punct"],
+        heads=[1, 1, 1, 1],
+        lemmas=["ich", "freuen", "ich", "."],
+    )
+
+    assert detector.detect_reflexive_verbs(doc) == [ReflexivePair(doc[1], doc[2], "sich freuen")]
+
+
+def test_reflexive_pronoun_falls_back_to_closest_verb(make_doc, detector):
+    # "sich" hangs off the subject noun, so the closest verb in the sentence is used
+    doc = make_doc(
+        words=["Die", "Kinder", "sich", "haben", "gewaschen", "."],
+        pos=["DET", "NOUN", "PRON", "AUX", "VERB", "PUNCT"],
+        deps=["nk", "sb", "nk", "ROOT", "oc", "punct"],
+        heads=[1, 3, 1, 3, 3, 3],
+        lemmas=["der", "Kind", "sich", "haben", "waschen", "."],
+    )
+
+    assert detector.detect_reflexive_verbs(doc) == [ReflexivePair(doc[3], doc[2], "sich haben")]
+
+
+def test_lazy_setup_is_safe_across_threads(make_doc):
+    # Without a vocab the Matchers are built on the first Doc; racing first calls
+    # must never see a half-built (pattern-less) Matcher
+    doc = make_doc(
+        words=["Ich", "stehe", "früh", "auf", "."],
+        pos=["PRON", "VERB", "ADV", "ADP", "PUNCT"],
+        deps=["sb", "ROOT", "mo", "svp", "punct"],
+        heads=[1, 1, 1, 1, 1],
+        lemmas=["ich", "stehen", "früh", "auf", "."],
+    )
+    threads = 8
+    # Switch threads as often as possible so a race surfaces within a few rounds
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for _ in range(50):
+            detector = SeparableVerbDetector()
+            barrier = threading.Barrier(threads)
+
+            def first_call(_):
+                barrier.wait()
+                return detector.detect_separable_verbs(doc)
+
+            with ThreadPoolExecutor(threads) as pool:
+                results = list(pool.map(first_call, range(threads)))
+
+            assert all(len(pairs) == 1 for pairs in results)
+    finally:
+        sys.setswitchinterval(switch_interval)
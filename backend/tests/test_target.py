@@ -0,0 +1,95 @@
+"""Tests for resolving target positions against cached analyses (no model needed)."""
+import orjson
+import pytest
+
+from app.cache import CachedAnalysis, PackedTokens
+from app.main import TARGET_FIELDS, with_target
+from app.models import AnalyzeResponse, TokenData
+
+# "Ich stehe früh auf ." with "stehe ... auf" paired as a separable verb
+TOKENS = [
+    TokenData(text="Ich", pos="PRON", lemma="ich", start=0, end=3),
+    TokenData(text="stehe", pos="VERB", lemma="aufstehen", start=4, end=9,
+              is_separable=True, separable_parts=["stehe", "auf"], paired_with=[15]),
+    TokenData(text="früh", pos="ADV", lemma="früh", start=10, end=14),
+    TokenData(text="auf", pos="VERB_PARTICLE", lemma="aufstehen", start=15, end=18,
+              is_separable=True, separable_parts=["stehe", "auf"], paired_with=[4]),
+    TokenData(text=".", pos="PUNCT", lemma=".", start=18, end=19),
+]
+
+
+def cached_analysis(tokens):
+    """Build a cache entry the way analyze_cached does."""
+    response = AnalyzeResponse.model_construct(tokens=[token.to_model() for token in tokens])
+    json_bytes = response.model_dump_json(exclude=TARGET_FIELDS).encode('utf-8')
+    return CachedAnalysis(PackedTokens(tokens), json_bytes)
+
+
+@pytest.fixture
+def packed():
+    return PackedTokens(TOKENS)
+
+
+@pytest.mark.parametrize("position, expected", [
+    (0, (0, [])),
+    (4, (1, [3])),  # first character of a token
+    (6, (1, [3])),
+    (8, (1, [3])),  # last character of a token
+    (15, (3, [1])),
+    (18, (4, [])),  # adjacent tokens: the end is exclusive, the next start inclusive
+])
+def test_find_target_inside_token(packed, position, expected):
+    assert packed.find_target(position) == expected
+
+
+@pytest.mark.parametrize("position", [3, 9, 14], ids=["after-first", "after-verb", "before-particle"])
+def test_find_target_between_tokens(packed, position):
+    assert packed.find_target(position) is None
+
+
+@pytest.mark.parametrize("position", [-1, 19, 100], ids=["negative", "text-end", "past-end"])
+def test_find_target_out_of_range(packed, position):
+    assert packed.find_target(position) is None
+
+
+def test_find_target_ignores_pairs_without_a_token_start():
+    tokens = [
+        TokenData(text="ruft", pos="VERB", lemma="anrufen", start=0, end=4, paired_with=[5, 7, 42]),
+        TokenData(text="an", pos="VERB_PARTICLE", lemma="anrufen", start=5, end=7),
+        TokenData(text="!", pos="PUNCT", lemma="!", start=7, end=8),
+    ]
+
+    # 42 is past the text; the other starts map to token indices in pairing order
+    assert PackedTokens(tokens).find_target(1) == (0, [1, 2])
+
+
+def test_empty_analysis_has_no_target():
+    assert PackedTokens([]).find_target(0) is None
+
+
+def test_with_target_splices_valid_response():
+    result = cached_analysis(TOKENS)
+
+    body = with_target(result, 16)
+
+    payload = orjson.loads(body)
+    assert payload["target_index"] == 3
+    assert payload["paired_indices"] == [1]
+    expected = AnalyzeResponse(
+        tokens=[token.to_model() for token in TOKENS], target_index=3, paired_indices=[1]
+    )
+    assert AnalyzeResponse.model_validate(payload) == expected
+
+
+@pytest.mark.parametrize("position", [None, 3, -5, 100])
+def test_with_target_without_match_returns_cached_body(position):
+    result = cached_analysis(TOKENS)
+
+    assert with_target(result, position) is result.json
+    assert "target_index" not in orjson.loads(result.json)
+
+
+def test_with_target_on_empty_analysis():
+    result = cached_analysis([])
+
+    assert orjson.loads(with_target(result, 0)) == {"tokens": []}
@@ -0,0 +1,102 @@
+"""Tests for VerbPrepositionDetector on hand-built spaCy Docs (no model needed)."""
+import pytest
+
+from app.verb_prepositions import PrepositionMatch, VerbPrepositionDetector
+
+
+@pytest.fixture
+def detector():
+    return VerbPrepositionDetector()
+
+
+@pytest.mark.parametrize("dep", ["op", "obj", "obl"])
+def test_prepositional_argument_labels(make_doc, detector, dep):
+    # "obj"/"obl" are spaCy symbols, so their ids are symbol ids rather than string hashes
+    doc = make_doc(
+        words=["Ich", "warte", "auf", "den", "Bus", "."],
+        pos=["PRON", "VERB", "ADP", "DET", "NOUN", "PUNCT"],
+        deps=["sb", "ROOT", dep, "nk", "nk", "punct"],
+        heads=[1, 1, 1, 4, 2, 1],
+        lemmas=["ich", "warten", "auf", "der", "Bus", "."],
+        morphs=["", "", "", "Case=Acc", "Case=Acc", ""],
+    )
+
+    results = detector.detect_verb_prepositions(doc, doc[1])
+
+    assert results == [PrepositionMatch(doc[2], "Akkusativ", doc[2].idx)]
+
+
+def test_pronominal_adverb_takes_dictionary_case(make_doc, detector):
+    doc = make_doc(
+        words=["Ich", "warte", "darauf", "."],
+        pos=["PRON", "VERB", "ADV", "PUNCT"],
+        deps=["sb", "ROOT", "mo", "punct"],
+        heads=[1, 1, 1, 1],
+        lemmas=["ich", "warten", "darauf", "."],
+    )
+
+    results = detector.detect_verb_prepositions(doc, doc[1])
+
+    assert results == [PrepositionMatch(doc[2], "Akkusativ", doc[2].idx)]
+
+
+def test_preposition_not_listed_for_verb_is_skipped(make_doc, detector):
+    doc = make_doc(
+        words=["Ich", "warte", "mit", "dir", "."],
+        pos=["PRON", "VERB", "ADP", "PRON", "PUNCT"],
+        deps=["sb", "ROOT", "op", "nk", "punct"],
+        heads=[1, 1, 1, 2, 1],
+        lemmas=["ich", "warten", "mit", "du", "."],
+        morphs=["", "", "", "Case=Dat", ""],
+    )
+
+    assert detector.detect_verb_prepositions(doc, doc[1]) == []
+
+
+@pytest.mark.parametrize("morph, case", [("Case=Acc", "Akkusativ"), ("", "Dativ")])
+def test_unlisted_verb_case_from_object_or_preposition(make_doc, detector, morph, case):
+    # "basteln" is not in VERB_PREPOSITION_MAP: the object's case wins, else the preposition's rule
+    doc = make_doc(
+        words=["Wir", "basteln", "mit", "Papier", "."],
+        pos=["PRON", "VERB", "ADP", "NOUN", "PUNCT"],
+        deps=["sb", "ROOT", "mo", "nk", "punct"],
+        heads=[1, 1, 1, 2, 1],
+        lemmas=["wir", "basteln", "mit", "Papier", "."],
+        morphs=["", "", "", morph, ""],
+    )
+
+    results = detector.detect_verb_prepositions(doc, doc[1])
+
+    assert results == [PrepositionMatch(doc[2], case, doc[2].idx)]
+
+
+def test_preposition_inside_subject_is_not_connected(make_doc, detector):
+    # The phrase reaches the verb through "sb", which is not an argument label
+    doc = make_doc(
+        words=["Bücher", "über", "Tiere", "gefallen", "mir", "."],
+        pos=["NOUN", "ADP", "NOUN", "VERB", "PRON", "PUNCT"],
+        deps=["sb", "mnr", "nk", "ROOT", "da", "punct"],
+        heads=[3, 0, 1, 3, 3, 3],
+        lemmas=["Buch", "über", "Tier", "gefallen", "ich", "."],
+    )
+
+    assert detector.detect_verb_prepositions(doc, doc[3]) == []
+
+
+def test_prep_index_matches_sentence_scan(make_doc, detector):
+    doc = make_doc(
+        words=["Ich", "warte", "auf", "den", "Bus", "und", "denke", "daran", "."],
+        pos=["PRON", "VERB", "ADP", "DET", "NOUN", "CCONJ", "VERB", "ADV", "PUNCT"],
+        deps=["sb", "ROOT", "op", "nk", "nk", "cd", "cj", "mo", "punct"],
+        heads=[1, 1, 1, 4, 2, 1, 5, 6, 1],
+        lemmas=["ich", "warten", "auf", "der", "Bus", "und", "denken", "daran", "."],
+        morphs=["", "", "", "Case=Acc", "Case=Acc", "", "", "", ""],
+    )
+    prep_index = detector.index_prepositions(doc)
+
+    for verb in (doc[1], doc[6]):
+        assert (detector.detect_verb_prepositions(doc, verb, prep_index=prep_index)
+                == detector.detect_verb_prepositions(doc, verb))
+    assert detector.detect_verb_prepositions(doc, doc[6], prep_index=prep_index) == [
+        PrepositionMatch(doc[7], "Akkusativ", doc[7].idx)
+    ]
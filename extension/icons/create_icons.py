@@ -4,6 +4,8 @@ Simple script to create placeholder icons for the Chrome extension.
 Requires: pip install pillow
 """
 
+from concurrent.futures import ThreadPoolExecutor
+
 try:
     from PIL import Image, ImageDraw, ImageFont
 except ImportError:
@@ -11,45 +13,80 @@ except ImportError:
     print("Please install it with: pip install pillow")
     exit(1)
 
-def create_icon(size, filename):
-    """Create a simple icon with 'De' text."""
+# Icons are drawn once at this size and downscaled to each target size
+# (when a scalable font is available)
+MASTER_SIZE = 256
+ICON_SIZES = (16, 48, 128)
+
+
+def load_font(font_size):
+    """Load the icon font at a given size, falling back to Pillow's default font."""
+    try:
+        # Try to use a nice font if available
+        return ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", font_size)
+    except (OSError, ImportError):
+        # Missing font file, or Pillow built without FreeType
+        pass
+    try:
+        # Pillow >= 10.1 can size the default font (scalable when FreeType is available)
+        return ImageFont.load_default(size=font_size)
+    except TypeError:
+        return ImageFont.load_default()
+
+
+def render_icon(size):
+    """
+    Draw the 'De' icon artwork at a given size.
+
+    Returns:
+        (image, scalable) where scalable is False if only a fixed-size bitmap
+        font was available, in which case the image must not be downscaled
+    """
     # Create image with purple background
     img = Image.new('RGB', (size, size), color=(103, 126, 234))
     draw = ImageDraw.Draw(img)
 
     # Add text
     text = "De"
-    font_size = size // 2
-    try:
-        # Try to use a nice font if available
-        font = ImageDraw.Font.truetype("/System/Library/Fonts/Helvetica.ttc", font_size)
-    except:
-        # Fall back to default font
-        font = None
-
-    # Calculate text position to center it
-    if font:
-        bbox = draw.textbbox((0, 0), text, font=font)
-        text_width = bbox[2] - bbox[0]
-        text_height = bbox[3] - bbox[1]
-    else:
-        # Rough estimate for default font
-        text_width = len(text) * (font_size // 2)
-        text_height = font_size
+    font = load_font(size // 2)
 
-    x = (size - text_width) // 2
-    y = (size - text_height) // 2
+    # Center the text using its measured bounding box
+    bbox = draw.textbbox((0, 0), text, font=font)
+    text_width = bbox[2] - bbox[0]
+    text_height = bbox[3] - bbox[1]
+    x = (size - text_width) // 2 - bbox[0]
+    y = (size - text_height) // 2 - bbox[1]
 
     # Draw text
     draw.text((x, y), text, fill=(255, 255, 255), font=font)
+    return img, isinstance(font, ImageFont.FreeTypeFont)
 
-    # Save
-    img.save(filename)
-    print(f"Created {filename}")
+
+def create_icon(master, size, filename):
+    """
+    Save one icon size.
+
+    Downscales the master artwork, or draws the icon directly at this size
+    when the master was drawn with a bitmap font that wouldn't survive scaling.
+    """
+    if master is not None:
+        icon = master.resize((size, size), Image.LANCZOS)
+    else:
+        icon, _ = render_icon(size)
+    icon.save(filename)
+    return filename
 
 if __name__ == "__main__":
-    create_icon(16, 'icon16.png')
-    create_icon(48, 'icon48.png')
-    create_icon(128, 'icon128.png')
+    master, scalable = render_icon(MASTER_SIZE)
+    if not scalable:
+        master = None
+    # Pillow releases the GIL while resizing and encoding, so threads can share the master
+    with ThreadPoolExecutor(max_workers=len(ICON_SIZES)) as executor:
+        filenames = executor.map(
+            lambda size: create_icon(master, size, f'icon{size}.png'), ICON_SIZES
+        )
+        # Report in size order once each icon is written
+        for filename in filenames:
+            print(f"Created {filename}")
     print("\nIcons created successfully!")
     print("Note: These are placeholder icons. Consider creating better graphics for production.")
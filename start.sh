@@ -3,4 +3,5 @@
 # Navigate to backend and start server
 cd backend
 echo "Starting FastAPI server..."
-exec uvicorn app.main:app --host 0.0.0.0 --port $PORT
+# Workers default to $WEB_CONCURRENCY (or 1); each worker loads its own model and cache
+exec uvicorn app.main:app --host 0.0.0.0 --port $PORT --loop uvloop --http httptools